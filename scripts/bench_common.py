@@ -0,0 +1,48 @@
+"""
+Timing, memory and baseline helpers shared by the benchmark scripts
+
+bench_pdf_parser.py and bench_video_to_ascii.py each flatten their results
+to {label: rate} and use compare() to check them against a saved baseline.
+"""
+
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """Peak traced allocation in bytes while fn runs (this process only, so not workers)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(rates: Dict[str, float], baseline: Dict[str, float], threshold: float,
+            unit: str) -> List[str]:
+    """Describe every rate that fell more than `threshold` below its baseline.
+
+    Labels missing from the baseline, or with a zero baseline rate, are skipped.
+    """
+    regressions = []
+    for label, rate in rates.items():
+        base = baseline.get(label)
+        if not base:
+            continue
+        ratio = rate / base
+        if ratio < 1 - threshold:
+            regressions.append(
+                f"{label}: {rate:.0f} {unit} vs baseline {base:.0f} ({(ratio - 1) * 100:+.0f}%)")
+    return regressions
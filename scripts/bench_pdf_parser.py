@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the SF2e statblock parser
+
+Generates synthetic Alien Core style statblock text (no PDF or network
+needed), times block discovery and every parse_* stage, and optionally
+compares throughput against a saved baseline.
+
+Usage:
+    python3 scripts/bench_pdf_parser.py
+    python3 scripts/bench_pdf_parser.py --sizes 10 1000 --save-baseline bench-baseline.json
+    python3 scripts/bench_pdf_parser.py --baseline bench-baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bench_common import compare, peak_memory, timed
+from pdf_parser import SF2eStatblockParser, StatblockSections, sanitize_skills
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+SYLLABLES = ['ar', 'bu', 'kor', 'vex', 'zan', 'thal', 'ish', 'mor', 'qua', 'rel',
+             'sek', 'tor', 'ul', 'yx', 'dra', 'shi', 'nok', 'pha', 'gri', 'el']
+NAME_SUFFIXES = ['Drone', 'Stalker', 'Matriarch', 'Hatchling', 'Sentinel', 'Reaver',
+                 'Swarm', 'Warden', 'Husk', 'Behemoth']
+SIZES = ['TINY', 'SMALL', 'MEDIUM', 'LARGE', 'HUGE', 'GARGANTUAN']
+TYPES = ['ABERRATION', 'ANIMAL', 'CONSTRUCT TECH', 'HUMANOID VESK', 'UNDEAD',
+         'DRAGON', 'OOZE', 'FIEND', 'ELEMENTAL', 'PLANT']
+SENSES = ['darkvision', 'low-light vision', 'blindsense (precise) 60 feet',
+          'tremorsense (imprecise) 30 feet', 'see invisibility']
+LANGUAGES = ['Common', 'Vesk', 'Ysoki', 'Shirren', 'Aballonian', 'Trinary', 'Eoxian']
+SKILLS = ['Acrobatics', 'Athletics', 'Computers', 'Deception', 'Intimidation',
+          'Piloting', 'Stealth', 'Survival', 'Engineering', 'Warfare Lore']
+WEAPONS = [('claw', 'agile, finesse', 'slashing'), ('jaws', 'reach 10 feet', 'piercing'),
+           ('tail', 'sweep', 'bludgeoning'), ('tactical baton', 'agile, nonlethal', 'bludgeoning')]
+RANGED_WEAPONS = [('laser rifle', 'range 120 feet', 'fire'), ('acid spit', 'range 30 feet', 'acid'),
+                  ('rotolaser', 'automatic, range 60 feet', 'fire'), ('quill', 'range 20 feet', 'piercing')]
+ACTIONS = ['[one-action]', '[two-actions]', '[three-actions]', '[reaction]', '[free-action]', '']
+ABILITY_WORDS = ['Frenzy', 'Shell Spin', 'Void Pulse', 'Hive Mind', 'Overclock',
+                 'Ferocity', 'Grab', 'Trample', 'Electric Surge', 'Adaptive Plating']
+LORE = ('These creatures roam the Drift in loose packs, and survivors describe them '
+        'as relentless; few settlements have records older than the Gap. ')
+
+
+def make_name(rng: random.Random) -> str:
+    word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+    return f"{word} {rng.choice(NAME_SUFFIXES)}"
+
+
+def make_statblock(rng: random.Random) -> List[str]:
+    """One statblock as PDF-extracted lines."""
+    level = rng.randint(-1, 25)
+    name = make_name(rng)
+    lines = [
+        f"{name.upper()} CREATURE {level}",
+        f"{rng.choice(['', 'UNCOMMON ', 'RARE '])}{rng.choice(SIZES)} {rng.choice(TYPES)}",
+        f"Perception +{level + rng.randint(3, 9)}; " + ', '.join(rng.sample(SENSES, rng.randint(1, 3))),
+        "Languages " + ', '.join(rng.sample(LANGUAGES, rng.randint(1, 4))),
+        "Skills " + ', '.join(f"{s} +{level + rng.randint(2, 12)}" for s in rng.sample(SKILLS, rng.randint(2, 5))),
+        ', '.join(f"{a} {rng.choice('+-')}{rng.randint(0, 7)}" for a in ['Str', 'Dex', 'Con', 'Int', 'Wis', 'Cha']),
+    ]
+    if rng.random() < 0.4:
+        lines.append("Items laser pistol (2 batteries), stun baton, medpatch")
+    lines += [
+        f"AC {level + 15}; Fort +{level + 8}, Ref +{level + 6}, Will +{level + 4}",
+        f"HP {max(5, level * 15 + 20)}; Immunities poison, fire; Resistances cold {max(1, level)}",
+    ]
+    if rng.random() < 0.3:
+        lines.append(f"Weaknesses sonic {max(1, level // 2)}")
+    lines.append(f"Speed {rng.choice([20, 25, 30, 40])} feet" + rng.choice(['', ', fly 40 feet', ', climb 20 feet']))
+    for _ in range(rng.randint(1, 3)):
+        weapon, traits, dtype = rng.choice(WEAPONS)
+        lines.append(f"Melee [one-action] {weapon} +{level + 10} ({traits}), Damage "
+                     f"{rng.randint(1, 4)}d{rng.choice([4, 6, 8, 10, 12])}+{max(0, level)} {dtype}")
+    for _ in range(rng.randint(0, 2)):
+        weapon, traits, dtype = rng.choice(RANGED_WEAPONS)
+        lines.append(f"Ranged [one-action] {weapon} +{level + 9} ({traits}), Damage "
+                     f"{rng.randint(1, 3)}d{rng.choice([6, 8, 10])} {dtype} plus 1d4 persistent {dtype}")
+    for _ in range(rng.randint(1, 5)):
+        traits = rng.choice(['', '(concentrate) ', '(attack, manipulate) '])
+        lines.append(f"{rng.choice(ABILITY_WORDS)} {rng.choice(ACTIONS)} {traits}"
+                     f"The creature channels its power. Each enemy within 30 feet takes "
+                     f"{rng.randint(2, 8)}d6 damage. Creatures that succeed take half.")
+    return lines
+
+
+def generate_corpus(blocks: int, seed: int = 1) -> str:
+    """Synthetic bestiary text with `blocks` statblocks and page-break noise."""
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for _ in range(blocks):
+        if rng.random() < 0.3:
+            lines += (LORE * rng.randint(1, 6)).split('; ')
+        lines += make_statblock(rng)
+
+    # Paginate like pdfplumber output: pages joined by blank lines, with
+    # running headers and page-number footers in between
+    pages = []
+    page_lines = 55
+    for page, start in enumerate(range(0, len(lines), page_lines), 1):
+        body = lines[start:start + page_lines]
+        pages.append('\n'.join([f"ALIEN CORE {page}"] + body + [str(page)]))
+    return '\n\n'.join(pages)
+
+
+def bench_size(parser: SF2eStatblockParser, size: int, repeat: int, seed: int) -> Dict[str, Any]:
+    """Time every stage for a corpus of `size` statblocks."""
+    text = generate_corpus(size, seed)
+    blocks = parser.find_creature_blocks(text)
+    texts = [b['text'] for b in blocks]
+
+    def each(method):
+        return lambda: [method(t) for t in texts]
+
+    stages = {
+        'find_creature_blocks': lambda: parser.find_creature_blocks(text),
+        'segment': each(StatblockSections),
+        'parse_traits': each(parser.parse_traits),
+        'parse_perception': each(parser.parse_perception),
+        'parse_languages': each(parser.parse_languages),
+        'parse_skills': each(lambda t: sanitize_skills(parser.parse_skills(t))),
+        'parse_abilities': each(parser.parse_abilities),
+        'parse_defenses': each(parser.parse_defenses),
+        'parse_speed': each(parser.parse_speed),
+        'parse_attacks': each(parser.parse_attacks),
+        'parse_special_abilities': each(parser.parse_special_abilities),
+        'parse_items': each(parser.parse_items),
+        'parse_statblock': lambda: [parser.parse_statblock(b) for b in blocks],
+    }
+
+    results = {}
+    for stage, fn in stages.items():
+        seconds = timed(fn, repeat)
+        results[stage] = {
+            'seconds': seconds,
+            'blocks_per_sec': len(blocks) / seconds if seconds > 0 else 0.0,
+        }
+
+    return {
+        'blocks': len(blocks),
+        'chars': len(text),
+        'peak_memory_bytes': peak_memory(
+            lambda: [parser.parse_statblock(b) for b in parser.find_creature_blocks(text)]),
+        'stages': results,
+    }
+
+
+def stage_rates(results: Dict[str, Any]) -> Dict[str, float]:
+    """Blocks per second for every size and stage, keyed for compare()."""
+    return {f"{size} blocks / {stage}": stats['blocks_per_sec']
+            for size, run in results.get('sizes', {}).items()
+            for stage, stats in run['stages'].items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the SF2e statblock parser on synthetic text')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                       help='Corpus sizes in statblocks (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per stage; the best time is kept (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=1,
+                       help='Corpus generator seed (default: %(default)s)')
+    parser.add_argument('--output', '-o', help='Write results JSON here')
+    parser.add_argument('--baseline', help='Baseline results JSON to compare against')
+    parser.add_argument('--save-baseline', help='Write results as a new baseline JSON')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                       help='Allowed throughput drop vs baseline before failing (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    statblock_parser = SF2eStatblockParser('synthetic.pdf')
+    results: Dict[str, Any] = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'sizes': {},
+    }
+
+    for size in args.sizes:
+        print(f"\n{size} statblocks")
+        print("-" * 60)
+        run = bench_size(statblock_parser, size, args.repeat, args.seed)
+        results['sizes'][str(size)] = run
+        for stage, stats in run['stages'].items():
+            print(f"  {stage:<26} {stats['blocks_per_sec']:>12.0f} blocks/s  {stats['seconds'] * 1000:>9.1f} ms")
+        print(f"  {'peak memory':<26} {run['peak_memory_bytes'] / 1024:>12.0f} KB")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(results, indent=2))
+            print(f"\nSaved results to {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(stage_rates(results), stage_rates(baseline), args.threshold, 'blocks/s')
+        if regressions:
+            print(f"\nThroughput regressions (threshold {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the video-to-ASCII converter
+
+Generates synthetic raw grayscale clips (no video file or ffmpeg needed),
+runs them through the same conversion core as video-to-ascii.py --raw for
+every output format, and optionally compares throughput against a saved
+baseline.
+
+Usage:
+    python3 scripts/bench_video_to_ascii.py
+    python3 scripts/bench_video_to_ascii.py --sizes 160x44 --save-baseline bench-ascii-baseline.json
+    python3 scripts/bench_video_to_ascii.py --baseline bench-ascii-baseline.json --threshold 0.2
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import platform
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from bench_common import compare, peak_memory, timed
+
+# The converter's file name has hyphens, so it is loaded by path
+_spec = importlib.util.spec_from_file_location(
+    'video_to_ascii', Path(__file__).with_name('video-to-ascii.py'))
+video_to_ascii = importlib.util.module_from_spec(_spec)
+sys.modules['video_to_ascii'] = video_to_ascii
+_spec.loader.exec_module(video_to_ascii)
+
+DEFAULT_SIZES = ['80x22', '160x44', '320x88']
+SCENES = ['noise', 'gradient', 'static']
+FORMATS = ['frames', 'delta', 'binary']
+FPS = 12
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    cols, rows = map(int, value.lower().split('x'))
+    return cols, rows
+
+
+def generate_clip(scene: str, cols: int, rows: int, frames: int, seed: int = 1) -> bytes:
+    """Raw gray frames: every cell changing, a scrolling gradient, or a still with one moving patch."""
+    rng = np.random.default_rng(seed)
+    if scene == 'noise':
+        return rng.integers(0, 256, (frames, rows, cols), dtype=np.uint8).tobytes()
+
+    y, x = np.mgrid[0:rows, 0:cols]
+    if scene == 'gradient':
+        t = np.arange(frames)[:, None, None]
+        return ((x * 255 // max(cols - 1, 1) + y * 4 + t * 3) % 256).astype(np.uint8).tobytes()
+
+    # A still background with a small block drifting across it, like a held shot
+    clip = np.repeat(rng.integers(0, 256, (1, rows, cols), dtype=np.uint8), frames, axis=0)
+    size = max(2, min(rows, cols) // 6)
+    for i, frame in enumerate(clip):
+        top = (i // 2) % max(rows - size, 1)
+        left = i % max(cols - size, 1)
+        frame[top:top + size, left:left + size] = 255
+    return clip.tobytes()
+
+
+def make_writer(fmt: str, cols: int, rows: int):
+    if fmt == 'delta':
+        return video_to_ascii.DeltaWriter(FPS, cols, rows)
+    if fmt == 'binary':
+        return video_to_ascii.BinaryWriter(FPS, cols, rows)
+    return video_to_ascii.FramesWriter(FPS, cols, rows)
+
+
+def convert(clip: bytes, fmt: str, cols: int, rows: int, jobs: int, output: Path) -> int:
+    """Convert and write one clip; returns the output size in bytes."""
+    writer = make_writer(fmt, cols, rows)
+    for _ in video_to_ascii.convert_stream(io.BytesIO(clip), [(writer, None)], cols * rows, jobs):
+        pass
+    writer.write(output)
+    return output.stat().st_size
+
+
+def bench_clip(clip: bytes, cols: int, rows: int, frames: int, repeat: int, jobs: int,
+               workdir: Path) -> Dict[str, Any]:
+    """Time every output format on one clip."""
+    results = {}
+    for fmt in FORMATS:
+        output = workdir / f"bench.{fmt}"
+        run = lambda: convert(clip, fmt, cols, rows, jobs, output)
+        seconds = timed(run, repeat)
+        results[fmt] = {
+            'seconds': seconds,
+            'frames_per_sec': frames / seconds if seconds > 0 else 0.0,
+            'mb_per_sec': len(clip) / seconds / 1e6 if seconds > 0 else 0.0,
+            'peak_memory_bytes': peak_memory(run),
+            'bytes_per_frame': output.stat().st_size / frames,
+        }
+    return results
+
+
+def format_rates(results: Dict[str, Any]) -> Dict[str, float]:
+    """Frames per second for every clip and format, keyed for compare()."""
+    return {f"{clip} / {fmt}": stats['frames_per_sec']
+            for clip, formats in results.get('clips', {}).items()
+            for fmt, stats in formats.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the video-to-ASCII converter on synthetic clips')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                       help='Frame sizes as COLSxROWS (default: %(default)s)')
+    parser.add_argument('--scenes', nargs='+', choices=SCENES, default=SCENES,
+                       help='Synthetic clips to convert (default: %(default)s)')
+    parser.add_argument('--frames', type=int, default=240,
+                       help='Frames per clip (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per format; the best time is kept (default: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Worker processes for conversion (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=1,
+                       help='Clip generator seed (default: %(default)s)')
+    parser.add_argument('--output', '-o', help='Write results JSON here')
+    parser.add_argument('--baseline', help='Baseline results JSON to compare against')
+    parser.add_argument('--save-baseline', help='Write results as a new baseline JSON')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                       help='Allowed throughput drop vs baseline before failing (default: %(default)s)')
+
+    args = parser.parse_args()
+    try:
+        sizes = [parse_size(size) for size in args.sizes]
+    except ValueError:
+        parser.error('--sizes takes COLSxROWS values, e.g. 160x44')
+
+    results: Dict[str, Any] = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'frames': args.frames,
+        'jobs': args.jobs,
+        'clips': {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for cols, rows in sizes:
+            for scene in args.scenes:
+                name = f"{scene}/{cols}x{rows}"
+                print(f"\n{name}, {args.frames} frames")
+                print("-" * 72)
+                clip = generate_clip(scene, cols, rows, args.frames, args.seed)
+                run = bench_clip(clip, cols, rows, args.frames, args.repeat, args.jobs, Path(workdir))
+                results['clips'][name] = run
+                for fmt, stats in run.items():
+                    print(f"  {fmt:<8} {stats['frames_per_sec']:>9.0f} frames/s  "
+                          f"{stats['mb_per_sec']:>7.1f} MB/s  "
+                          f"{stats['peak_memory_bytes'] / 1024:>8.0f} KB peak  "
+                          f"{stats['bytes_per_frame']:>9.0f} B/frame")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(results, indent=2))
+            print(f"\nSaved results to {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(format_rates(results), format_rates(baseline), args.threshold, 'frames/s')
+        if regressions:
+            print(f"\nThroughput regressions (threshold {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,25 +6,819 @@ Extracts creature statblocks from the Alien Core PDF and outputs JSON.
 Format based on SF2e/PF2e Remaster statblock structure.
 """
 
+import hashlib
+import os
 import re
 import json
+import shutil
+import signal
 import sys
-import uuid
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Union
+
+# Imported on first use, so the parsing code (and benchmarks) work without it
+pdfplumber = None
+
+
+def load_pdfplumber():
+    """Import pdfplumber, installing it if missing."""
+    global pdfplumber
+    if pdfplumber is None:
+        try:
+            import pdfplumber as module
+        except ImportError:
+            print("Installing pdfplumber...")
+            import subprocess
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "pdfplumber"])
+            import pdfplumber as module
+        pdfplumber = module
+    return pdfplumber
+
+
+def load_jsonschema():
+    """Import jsonschema, installing it if missing."""
+    try:
+        import jsonschema
+    except ImportError:
+        print("Installing jsonschema...")
+        import subprocess
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "jsonschema"])
+        import jsonschema
+    return jsonschema
+
+
+def default_jobs() -> int:
+    """Default number of extraction worker processes (one per core)."""
+    return os.cpu_count() or 1
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[Tuple[str, float]]:
+    """Extract (text, seconds) for pages [start, end) in a worker process.
+
+    Each worker opens the PDF itself - pdfplumber objects can't be pickled.
+    """
+    results = []
+    with load_pdfplumber().open(pdf_path) as pdf:
+        for i in range(start, end):
+            started = time.perf_counter()
+            text = pdf.pages[i].extract_text() or ""
+            results.append((text, time.perf_counter() - started))
+    return results
+
+
+# Statblock lines a continuation page carries; a page with none of them is
+# a section break (lore, art, a new chapter) and ends the open block
+STATBLOCK_LINE_HINT_RE = re.compile(
+    r"\[(?:one-action|two-actions|three-actions|reaction|free-action)\]"
+    r"|\b(?:Melee|Ranged|Trigger|Effect|Requirements|Frequency|Routine|Reset)\b"
+    r"|\b(?:AC|HP|Hardness|Speed|Perception|Fort|Ref|Will|Skills|Stealth)\s+(?:DC\s+)?[+-]?\d")
+
+
+def scan_statblock_pages(pdf_path: str, start: int, end: int,
+                         keywords: Iterable[str] = ('CREATURE',)) -> Optional[List[int]]:
+    """Pages in [start, end) that need full extraction, found with pdfium's text layer.
+
+    pypdfium2 ships with pdfplumber and reads a page's text far faster than
+    pdfplumber's layout extraction. A page is kept if it has a header for one
+    of the block keywords (CREATURE, HAZARD, ...), and, when the header is on
+    the page's first line, so is the page before it (whose last line may hold
+    the name). Pages after a header are kept as continuations while they
+    still carry statblock lines (Melee, Trigger, AC 20, ...); the first page
+    without any is a section break, and pages from there to the next header
+    are skipped. Returns None if the scan fails, meaning every page should
+    be extracted.
+    """
+    # Looser than the header pattern since pdfium's line breaks differ
+    hint_re = re.compile(rf"(?:{'|'.join(keywords)})\s*\d")
+    load_pdfplumber()
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+
+    keep = set()
+    try:
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            in_block = False
+            for i in range(start, end):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                match = hint_re.search(text)
+                if match:
+                    keep.add(i)
+                    if '\n' not in text[:match.start()]:
+                        keep.add(i - 1)
+                    in_block = True
+                elif in_block and STATBLOCK_LINE_HINT_RE.search(text):
+                    keep.add(i)
+                else:
+                    in_block = False
+        finally:
+            pdf.close()
+    except Exception as e:
+        print(f"  Page prefilter failed ({e}); extracting every page")
+        return None
+    return sorted(i for i in keep if start <= i < end)
+
+
+def chunk_pages(pages: List[int], chunks: int) -> List[tuple]:
+    """Group sorted page indices into contiguous (start, end) ranges.
+
+    Ranges break at gaps (e.g. pages already in the cache) and are capped so
+    the work splits into roughly `chunks` pieces.
+    """
+    if not pages:
+        return []
+    max_size = max(1, -(-len(pages) // max(1, chunks)))
+    ranges = []
+    lo = prev = pages[0]
+    for page in pages[1:]:
+        if page != prev + 1 or page - lo >= max_size:
+            ranges.append((lo, prev + 1))
+            lo = page
+        prev = page
+    ranges.append((lo, prev + 1))
+    return ranges
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache location for extracted page text."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'damoritoshs-arena' / 'pdf-text'
+
+
+class PageTextCache:
+    """On-disk cache of extracted page text.
+
+    Entries are keyed by PDF content hash, pdfplumber version and page index,
+    so editing the parsing code never invalidates them but a different book
+    or a pdfplumber upgrade does. Reads refresh an entry's mtime and eviction
+    drops the least recently used entries once the cache exceeds its cap.
+    """
+
+    DEFAULT_MAX_MB = 256
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MAX_MB * 1024 * 1024
+
+    def _entry_path(self, pdf_hash: str, page: int) -> Path:
+        return self.cache_dir / f"{pdf_hash}-{load_pdfplumber().__version__}" / f"{page:05d}.txt"
+
+    def contains(self, pdf_hash: str, page: int) -> bool:
+        """Whether a page is cached, without reading it."""
+        return self._entry_path(pdf_hash, page).exists()
+
+    def get(self, pdf_hash: str, page: int) -> Optional[str]:
+        """Return cached text for a page, or None on a miss."""
+        path = self._entry_path(pdf_hash, page)
+        try:
+            text = path.read_text(encoding='utf-8')
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return text
+
+    def put(self, pdf_hash: str, page: int, text: str):
+        """Store text for a page, writing atomically."""
+        path = self._entry_path(pdf_hash, page)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(text, encoding='utf-8')
+        os.replace(tmp, path)
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under the size cap."""
+        if not self.cache_dir.exists():
+            return 0
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob('*/*.txt'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        # Drop directories left empty by eviction
+        for entry_dir in self.cache_dir.iterdir():
+            if entry_dir.is_dir() and not any(entry_dir.iterdir()):
+                entry_dir.rmdir()
+        return removed
+
+    def clear(self):
+        """Remove every cached entry."""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+
+
+class ExtractionQueue:
+    """Page ranges from one or more PDFs, extracted on one worker pool in submission order.
+
+    Only `in_flight` ranges are submitted at a time; the rest wait until the
+    head of the queue is taken, so memory stays bounded while the pool moves
+    straight from one book's pages to the next.
+    """
+
+    def __init__(self, pool: ProcessPoolExecutor, in_flight: int):
+        self.pool = pool
+        self.in_flight = in_flight
+        self.waiting: deque = deque()     # (pdf_path, lo, hi) not yet submitted
+        self.pending: deque = deque()     # (pdf_path, lo, future)
+
+    def add(self, pdf_path: str, ranges: List[tuple]):
+        self.waiting.extend((pdf_path, lo, hi) for lo, hi in ranges)
+        self._submit()
+
+    def _submit(self):
+        while self.waiting and len(self.pending) < self.in_flight:
+            pdf_path, lo, hi = self.waiting.popleft()
+            self.pending.append((pdf_path, lo, self.pool.submit(_extract_page_range, pdf_path, lo, hi)))
+
+    def next_range(self, pdf_path: str) -> Tuple[int, List[Tuple[str, float]]]:
+        """Wait for the range at the head of the queue, which must belong to pdf_path."""
+        path, lo, future = self.pending.popleft()
+        assert path == pdf_path, f"extraction queue out of order ({path} before {pdf_path})"
+        texts = future.result()
+        self._submit()
+        return lo, texts
+
+
+class StageTimer:
+    """Wall time per parse stage for one statblock, measured lap by lap."""
+
+    __slots__ = ('stages', '_last')
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        """Charge the time since the previous lap to `stage`."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+class BlockBudgetExceeded(Exception):
+    """A statblock took longer to parse than the per-block time budget."""
+
+
+@contextmanager
+def time_budget(seconds: Optional[float]):
+    """Raise BlockBudgetExceeded if the body runs longer than `seconds`.
+
+    Uses SIGALRM, which also interrupts a runaway regex. Where that isn't
+    available (Windows, or off the main thread) the budget is only checked
+    once the body finishes.
+    """
+    if not seconds:
+        yield
+        return
+
+    use_alarm = (hasattr(signal, 'setitimer')
+                 and threading.current_thread() is threading.main_thread())
+    if use_alarm:
+        def on_alarm(signum, frame):
+            raise BlockBudgetExceeded()
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    if time.perf_counter() - started > seconds:
+        raise BlockBudgetExceeded()
+
+
+class ParseProfile:
+    """Timings gathered by --profile: extraction per page, parse stages per block."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.pages: List[Dict[str, Any]] = []
+        self.blocks: List[Dict[str, Any]] = []
+        # Time the parsing loop spent waiting on page text (extraction or cache)
+        self.page_wait_seconds = 0.0
+        # Pages the prefilter ruled out before extraction
+        self.skipped_pages = 0
+
+    def add_page(self, page: int, seconds: float, cached: bool):
+        self.pages.append({'page': page + 1, 'seconds': seconds, 'cached': cached})
+
+    def add_block(self, block: Dict[str, Any], status: str, seconds: float,
+                  stages: Optional[Dict[str, float]] = None):
+        self.blocks.append({
+            'name': block['name'],
+            'level': block['level'],
+            'page': block['page'] + 1,
+            'status': status,
+            'seconds': seconds,
+            'stages': stages or {},
+        })
+
+    def slowest_blocks(self, top: int) -> List[Dict[str, Any]]:
+        return sorted(self.blocks, key=lambda b: b['seconds'], reverse=True)[:top]
+
+    def report(self, top: int) -> Dict[str, Any]:
+        """Machine-readable summary; page numbers are 1-based."""
+        wall = time.perf_counter() - self.started
+        stage_totals: Dict[str, float] = {}
+        for block in self.blocks:
+            for stage, seconds in block['stages'].items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+        parse_seconds = sum(b['seconds'] for b in self.blocks)
+        statuses: Dict[str, int] = {}
+        for block in self.blocks:
+            statuses[block['status']] = statuses.get(block['status'], 0) + 1
+
+        return {
+            'wall_seconds': wall,
+            'extraction': {
+                'pages': len(self.pages),
+                'cached_pages': sum(1 for p in self.pages if p['cached']),
+                'skipped_pages': self.skipped_pages,
+                'worker_seconds': sum(p['seconds'] for p in self.pages),
+                'wait_seconds': self.page_wait_seconds,
+            },
+            'parsing': {
+                'blocks': len(self.blocks),
+                'statuses': statuses,
+                'seconds': parse_seconds,
+                'stage_seconds': stage_totals,
+            },
+            # Whatever isn't waiting on pages or parsing blocks: header search,
+            # dedup, output
+            'other_seconds': max(0.0, wall - self.page_wait_seconds - parse_seconds),
+            'slowest_blocks': self.slowest_blocks(top),
+            'pages': self.pages,
+            'blocks': self.blocks,
+        }
+
+
+SCHEMAS_DIR = Path(__file__).resolve().parent.parent / 'public' / 'schemas'
+DEFAULT_SCHEMA_PATH = SCHEMAS_DIR / 'creatures.schema.json'
+
+
+def compile_record_validator(schema_path: Path):
+    """jsonschema validator for one record of a schema that describes an array."""
+    jsonschema = load_jsonschema()
+    schema = json.loads(Path(schema_path).read_text(encoding='utf-8'))
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    # The file describes the whole array; records are checked one at a time
+    return validator_class(dict(schema['items'], definitions=schema.get('definitions', {})))
+
+
+# The schema validator compiled in each validation worker process
+_record_validator = None
+
+
+def _init_validation_worker(schema_path: Path):
+    global _record_validator
+    _record_validator = compile_record_validator(schema_path)
+
+
+def _validate_records(batch: List[Dict[str, Any]]) -> Tuple[List[List[Dict[str, str]]], float]:
+    """Violations ({path, message}) of each record, and the seconds spent, in a worker process."""
+    started = time.perf_counter()
+    results = []
+    for record in batch:
+        errors = sorted(_record_validator.iter_errors(record), key=lambda e: list(e.absolute_path))
+        results.append([{'path': json_path(e.absolute_path), 'message': e.message} for e in errors])
+    return results, time.perf_counter() - started
+
+
+class SchemaValidator:
+    """Check parsed records against a JSON schema as they stream out of the parser.
+
+    Records are validated in batches in a worker process, which compiles the
+    schema once, so the check runs alongside parsing instead of taking turns
+    with it for the GIL. In strict mode a batch is only released once
+    validated, with invalid records left out.
+    """
+
+    BATCH_SIZE = 64
+
+    def __init__(self, schema_path: Path = DEFAULT_SCHEMA_PATH, strict: bool = False):
+        # Compiled here too, so a broken schema fails before any parsing
+        compile_record_validator(schema_path)
+        self.schema_path = Path(schema_path)
+        self.strict = strict
+        self.checked = 0
+        self.excluded = 0
+        self.seconds = 0.0
+        self.violations: List[Dict[str, Any]] = []
+
+    def _collect(self, batch: List[Dict[str, Any]], future) -> List[bool]:
+        """Record a validated batch's violations; returns whether each record is valid."""
+        results, seconds = future.result()
+        for record, errors in zip(batch, results):
+            for error in errors:
+                self.violations.append({'id': record.get('id'), 'source': record.get('source'), **error})
+        self.checked += len(batch)
+        self.seconds += seconds
+        return [not errors for errors in results]
+
+    def run(self, creatures: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield creatures while validating them; strict mode drops invalid ones."""
+        with ProcessPoolExecutor(max_workers=1, initializer=_init_validation_worker,
+                                 initargs=(self.schema_path,)) as pool:
+            pending: deque = deque()    # (batch, future)
+            batch: List[Dict[str, Any]] = []
+
+            def release(wait_all: bool):
+                # Strict mode holds a batch until its result is in; at most
+                # one full batch waits while the next is being parsed
+                while pending and (wait_all or len(pending) > 1 or pending[0][1].done()):
+                    done_batch, future = pending.popleft()
+                    for creature, ok in zip(done_batch, self._collect(done_batch, future)):
+                        if ok:
+                            yield creature
+                        else:
+                            self.excluded += 1
+
+            for creature in creatures:
+                if not self.strict:
+                    yield creature
+                batch.append(creature)
+                if len(batch) >= self.BATCH_SIZE:
+                    pending.append((batch, pool.submit(_validate_records, batch)))
+                    batch = []
+                    if self.strict:
+                        yield from release(wait_all=False)
+                    else:
+                        while pending and pending[0][1].done():
+                            self._collect(*pending.popleft())
+            if batch:
+                pending.append((batch, pool.submit(_validate_records, batch)))
+            if self.strict:
+                yield from release(wait_all=True)
+            else:
+                while pending:
+                    self._collect(*pending.popleft())
+
+    def print_report(self):
+        invalid_ids = {(v['source'], v['id']) for v in self.violations}
+        print(f"\nSchema check ({self.schema_path.name}): {self.checked} records in {self.seconds:.2f}s, "
+              f"{len(self.violations)} violations in {len(invalid_ids)} records"
+              + (f", {self.excluded} excluded (--strict)" if self.strict else ''))
+        for v in self.violations:
+            print(f"  {v['id']} {v['path']}: {v['message']}")
+
+
+def json_path(path: Iterable[Any]) -> str:
+    """JSONPath for a jsonschema error location, e.g. $.attacks[0].damage."""
+    return '$' + ''.join(f"[{p}]" if isinstance(p, int) else f".{p}" for p in path)
+
+
+# Statblock patterns, compiled once at import rather than per block
+ID_INVALID_RE = re.compile(r'[^a-z0-9]+')
+NEWLINES_RE = re.compile(r'\n+')
+WHITESPACE_RE = re.compile(r'\s+')
+ALL_CAPS_WORD_RE = re.compile(r'^[A-Z]{4,}$')
+DIGITS_RE = re.compile(r'^\d+$')
+WHITESPACE_PREFIX_RE = re.compile(r'\s*')
+PERCEPTION_RE = re.compile(r'Perception\s+([+-]?\d+)(?:[;,]\s*(.+?))?(?=\n|Languages|Skills)', re.IGNORECASE)
+LANGUAGES_RE = re.compile(r'Languages\s+(.+?)(?=\n|Skills)', re.IGNORECASE)
+SKILLS_RE = re.compile(r'Skills\s+(.+?)(?=\nStr|$)', re.IGNORECASE | re.DOTALL)
+SKILL_ENTRY_RE = re.compile(r'([A-Za-z][A-Za-z\s]+?)\s+([+-]\d+)')
+ABILITY_RES = {
+    ability: re.compile(rf'\b{ability}\s+([+-]?\d+)', re.IGNORECASE)
+    for ability in ('str', 'dex', 'con', 'int', 'wis', 'cha')
+}
+AC_RE = re.compile(r'AC\s+(\d+)', re.IGNORECASE)
+SAVE_RES = {
+    save: re.compile(rf'{save}\s+([+-]?\d+)', re.IGNORECASE)
+    for save in ('fort', 'ref', 'will')
+}
+HP_RE = re.compile(r'HP\s+(\d+)', re.IGNORECASE)
+IMMUNITIES_RE = re.compile(r'Immunities\s+(.+?)(?=;|Resistances|Weaknesses|Speed|\n\n)', re.IGNORECASE)
+RESISTANCES_RE = re.compile(r'Resistances\s+(.+?)(?=;|Weaknesses|Speed|\n\n)', re.IGNORECASE)
+WEAKNESSES_RE = re.compile(r'Weaknesses\s+(.+?)(?=;|Speed|\n\n)', re.IGNORECASE)
+SPEED_RE = re.compile(r'Speed\s+(.+?)(?=\n|Melee|Ranged)', re.IGNORECASE)
+SPEED_TRAILING_RE = re.compile(r'\s+(to arcane|such as|Caypin|[A-Z][a-z]+\s+CREATURE).*$', re.IGNORECASE)
+# Melee/Ranged [one-action] name +X (traits), Damage XdX+X type
+MELEE_RE = re.compile(r'Melee\s+\[one-action\]\s*([^+]+?)\s+([+-]\d+)\s*(?:\(([^)]+)\))?,?\s*Damage\s+([^\n;]+)', re.IGNORECASE)
+RANGED_RE = re.compile(r'Ranged\s+\[one-action\]\s*([^+]+?)\s+([+-]\d+)\s*(?:\(([^)]+)\))?,?\s*Damage\s+([^\n;]+)', re.IGNORECASE)
+# Name [action-type] (traits) Description, or Name Description for passives
+SPECIAL_ABILITY_RE = re.compile(r'\n([A-Z][A-Za-z\s\']+)\s+(\[(?:one-action|two-actions|three-actions|reaction|free-action)\])?\s*(?:\(([^)]+)\))?\s+([A-Z][^.]+\.(?:[^.]+\.)*)')
+ITEMS_RE = re.compile(r'Items\s+(.+?)(?=\nAC|\n\n)', re.IGNORECASE)
+
+# Hazard statblock fields
+HAZARD_TRAIT_LINE_RE = re.compile(r"^[A-Z][A-Z' -]*$")
+STEALTH_RE = re.compile(r'Stealth\s+([^\n]+)')
+STEALTH_DC_RE = re.compile(r'(DC\s*)?([+-]?\d+)')
+DESCRIPTION_RE = re.compile(r'Description\s+(.+?)(?=\n(?:Disable|AC|Hardness|HP|Routine|Reset)\b|\n\n|\Z)', re.DOTALL)
+DISABLE_RE = re.compile(r"Disable\s+(.+?)(?=\n(?:AC|Hardness|HP|Routine|Reset)\b|\n[A-Z][A-Za-z' -]+?\s+\[|\n\n|\Z)", re.DOTALL)
+HAZARD_DEFENSE_LINE_RE = re.compile(r'^AC\s+\d+[^\n]*', re.MULTILINE)
+HAZARD_HP_LINE_RE = re.compile(r'^(?:Hardness|HP)\b[^\n]*', re.MULTILINE)
+HARDNESS_RE = re.compile(r'Hardness\s+(\d+)')
+BT_RE = re.compile(r'\(BT\s+(\d+)\)')
+HAZARD_ACTION_RE = re.compile(
+    r"^([A-Z][A-Za-z' -]+?)\s+(\[(?:one-action|two-actions|three-actions|reaction|free-action)\])\s*"
+    r"(?:\(([^)]+)\))?\s*(.+?)(?=\n[A-Z][A-Za-z' -]+?\s+\[|\n(?:Routine|Reset|Melee|Ranged)\b|\n\n|\Z)",
+    re.MULTILINE | re.DOTALL)
+TRIGGER_EFFECT_RE = re.compile(r'Trigger\s+(.+?);\s*Effect\s+(.+)', re.DOTALL)
+# "deals 4d8+10 fire damage plus 1d6 persistent fire damage" in an action's effect
+HAZARD_DAMAGE_RE = re.compile(
+    r'\d+d\d+(?:[+-]\d+)?[^.;]*?\s+damage(?:\s+plus\s+\d+d\d+(?:[+-]\d+)?[^.;]*?\s+damage)*')
+DAMAGE_WORD_RE = re.compile(r'\s+damage\b')
+ROUTINE_RE = re.compile(r'Routine\s+\((\d+)\s+actions?\)\s*(.+?)(?=\n(?:Melee|Ranged|Reset)\b|\n\n|\Z)', re.DOTALL)
+RESET_RE = re.compile(r'Reset\s+(.+?)(?=\n[A-Z]|\n\n|\Z)', re.DOTALL)
+
+# Damage expressions, read the same way as cleanDamage/parseDamageExpression
+# in src/utils/dice.ts so precomputed dice match what the app would roll
+DAMAGE_ARTIFACT_RE = re.compile(r'[A-Z][\u2014\u2013-][A-Z]')
+DAMAGE_PLUS_RE = re.compile(r'\s+plus\s+', re.IGNORECASE)
+DAMAGE_JUNK_RE = re.compile(r'[^0-9d+\-\sA-Za-z_]')
+DICE_TERM_RE = re.compile(r'([0-9]+)d([0-9]+)([+-][0-9]+)?(?:\s+(.+))?\s*')
+
+# Labels that start a statblock field. Every field pattern above that is
+# located through StatblockSections begins with one of these literals.
+STATBLOCK_LABELS = (
+    'perception', 'languages', 'skills', 'items',
+    'str', 'dex', 'con', 'int', 'wis', 'cha',
+    'ac', 'fort', 'ref', 'will', 'hp',
+    'immunities', 'resistances', 'weaknesses',
+    'speed', 'melee', 'ranged',
+)
+# Zero-width so overlapping labels ("skillStr", "aCHA") are all reported.
+# No label is a prefix of another, so at most one group matches per position.
+STATBLOCK_LABEL_RE = re.compile(
+    '(?=' + '|'.join(f'(?P<{label}>{label})' for label in STATBLOCK_LABELS) + ')',
+    re.IGNORECASE,
+)
+# Non-ASCII characters that IGNORECASE treats as ASCII letters (dotted and
+# dotless I, long s, Kelvin sign). str.lower() can't stand in for the regex
+# scan when these are present.
+CASEFOLD_ODDITIES_RE = re.compile('[\u0130\u0131\u017f\u212a]')
+
+
+class StatblockSections:
+    """A statblock's text cut into labelled sections, located once up front.
+
+    Records where every field label (Perception, Languages, Skills, Str...,
+    AC/saves/HP, Speed, Melee/Ranged, ...) occurs. Field parsers then only
+    try their pattern at their own label's offsets, so each section is read
+    from its label up to wherever that field's terminator ends it, instead
+    of rescanning the whole block once per field.
+    """
+
+    __slots__ = ('text', 'positions')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.positions: Dict[str, List[int]] = {}
+
+        if CASEFOLD_ODDITIES_RE.search(text):
+            for match in STATBLOCK_LABEL_RE.finditer(text):
+                self.positions.setdefault(match.lastgroup, []).append(match.start())
+            return
+
+        # Lowercasing keeps offsets aligned once the oddities are ruled out,
+        # and str.find is far cheaper than a case-insensitive alternation
+        lowered = text.lower()
+        for label in STATBLOCK_LABELS:
+            start = lowered.find(label)
+            if start == -1:
+                continue
+            positions = []
+            while start != -1:
+                positions.append(start)
+                start = lowered.find(label, start + 1)
+            self.positions[label] = positions
+
+    def search(self, label: str, pattern: 're.Pattern') -> Optional['re.Match']:
+        """First match of a label-prefixed pattern; same result as pattern.search(text)."""
+        for start in self.positions.get(label, ()):
+            match = pattern.match(self.text, start)
+            if match:
+                return match
+        return None
+
+    def finditer(self, label: str, pattern: 're.Pattern'):
+        """Non-overlapping matches; same results as pattern.finditer(text)."""
+        end = 0
+        for start in self.positions.get(label, ()):
+            if start < end:
+                continue
+            match = pattern.match(self.text, start)
+            if match:
+                end = match.end()
+                yield match
+
 
-try:
-    import pdfplumber
-except ImportError:
-    print("Installing pdfplumber...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pdfplumber"])
-    import pdfplumber
+def block_header_re(keywords: Iterable[str]) -> 're.Pattern':
+    """Statblock header pattern: NAME KEYWORD LEVEL, e.g. "VOID OOZE CREATURE 3"."""
+    return re.compile(rf"([A-Z][A-Za-z\s\'-]+?)\s+({'|'.join(keywords)})\s+(\d+)\s*\n")
+
+
+# Characters a header match can contain besides whitespace
+HEADER_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'-")
+
+
+def header_tail_start(text: str, lo: int) -> int:
+    """Start of the trailing run of text[lo:] that a header match could still use.
+
+    A statblock header only contains letters, digits, whitespace, apostrophes
+    and hyphens, so no header can begin before the last other character.
+    """
+    i = len(text)
+    while i > lo and (text[i - 1] in HEADER_CHARS or text[i - 1].isspace()):
+        i -= 1
+    return i
+
+
+def creature_hash(creature: Dict[str, Any]) -> str:
+    """Stable content hash of a creature, independent of key order and formatting."""
+    canonical = json.dumps(creature, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def read_json_entries(path: Path) -> List[Tuple[Dict[str, Any], str]]:
+    """Read a JSON array, returning each element with its exact source text."""
+    text = path.read_text(encoding='utf-8')
+    decoder = json.JSONDecoder()
+    entries = []
+
+    pos = WHITESPACE_PREFIX_RE.match(text).end()
+    if text[pos:pos + 1] != '[':
+        raise ValueError(f"{path} does not contain a JSON array")
+    pos = WHITESPACE_PREFIX_RE.match(text, pos + 1).end()
+    if text[pos:pos + 1] == ']':
+        return entries
+
+    while True:
+        value, end = decoder.raw_decode(text, pos)
+        entries.append((value, text[pos:end]))
+        pos = WHITESPACE_PREFIX_RE.match(text, end).end()
+        if text[pos:pos + 1] == ']':
+            return entries
+        if text[pos:pos + 1] != ',':
+            raise ValueError(f"{path}: expected ',' or ']' at offset {pos}")
+        pos = WHITESPACE_PREFIX_RE.match(text, pos + 1).end()
+
+
+def format_json_entry(value: Any) -> str:
+    """Serialize an array element the way JSON.stringify(data, null, 2) nests it."""
+    return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+
+
+SHARD_MANIFEST_VERSION = 1
+# Fields kept in the always-loaded summary file
+SUMMARY_FIELDS = ('id', 'name', 'level', 'traits', 'size', 'source')
+
+
+def sharded_output_dir(output_path: str) -> Path:
+    """Directory for sharded output: creatures.json -> creatures/."""
+    output = Path(output_path)
+    return output.with_suffix('') if output.suffix == '.json' else output
+
+
+def shard_key(creature: Dict[str, Any], shard_by: str, shard_size: int, buckets: int) -> str:
+    """Shard name for a creature: a level range, or a bucket of its id hash."""
+    if shard_by == 'level':
+        # Level ranges start at -1, the lowest creature level
+        lo = -1 + ((creature['level'] + 1) // shard_size) * shard_size
+        hi = lo + shard_size - 1
+        # 'm1' rather than '-1' keeps file names unambiguous
+        return f"level-{lo if lo >= 0 else f'm{-lo}'}-{hi}"
+    bucket = int(hashlib.sha256(creature['id'].encode('utf-8')).hexdigest(), 16) % buckets
+    return f"hash-{bucket:03d}"
+
+
+def write_sharded(creatures: List[Dict[str, Any]], out_dir: Path,
+                  shard_by: str = 'level', shard_size: int = 3) -> Dict[str, Any]:
+    """Write a summary file, full stat blocks split into shards, and a manifest.
+
+    shard_size is levels per shard for shard_by='level', or the target number
+    of creatures per shard for shard_by='hash'. Shard file names carry a
+    content hash so they can be cached indefinitely; the manifest maps every
+    id to its shard and keeps the original order for read_sharded.
+    """
+    shards_dir = out_dir / 'shards'
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    buckets = max(1, -(-len(creatures) // shard_size))
+
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for creature in creatures:
+        grouped.setdefault(shard_key(creature, shard_by, shard_size, buckets), []).append(creature)
+
+    shard_entries = []
+    shard_of: Dict[str, str] = {}
+    written = set()
+    for key in sorted(grouped):
+        content = json.dumps(grouped[key], separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        file_name = f"{key}.{digest[:12]}.json"
+        (shards_dir / file_name).write_bytes(content)
+        written.add(file_name)
+        levels = [c['level'] for c in grouped[key]]
+        shard_entries.append({
+            'file': f"shards/{file_name}",
+            'hash': digest,
+            'count': len(grouped[key]),
+            'bytes': len(content),
+            'levels': [min(levels), max(levels)],
+        })
+        for creature in grouped[key]:
+            shard_of[creature['id']] = f"shards/{file_name}"
+
+    # Old shards from earlier runs would otherwise pile up
+    for stale in shards_dir.glob('*.json'):
+        if stale.name not in written:
+            stale.unlink()
+
+    summary = [{field: c[field] for field in SUMMARY_FIELDS if field in c} for c in creatures]
+    (out_dir / 'summary.json').write_text(
+        json.dumps(summary, separators=(',', ':'), ensure_ascii=False), encoding='utf-8')
+
+    manifest = {
+        'version': SHARD_MANIFEST_VERSION,
+        'count': len(creatures),
+        'shardBy': shard_by,
+        'shardSize': shard_size,
+        'summary': 'summary.json',
+        'order': [c['id'] for c in creatures],
+        'shards': shard_entries,
+        'ids': shard_of,
+    }
+    (out_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    print(f"\nSaved {len(creatures)} creatures to {out_dir} "
+          f"({len(shard_entries)} shards by {shard_by}, summary + manifest)")
+    return manifest
+
+
+def read_sharded(out_dir: Path) -> List[Dict[str, Any]]:
+    """Reassemble sharded output into the single-file creature list, in original order."""
+    manifest = json.loads((out_dir / 'manifest.json').read_text(encoding='utf-8'))
+    if manifest.get('version') != SHARD_MANIFEST_VERSION:
+        raise ValueError(f"Unsupported shard manifest version: {manifest.get('version')}")
+
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for shard in manifest['shards']:
+        content = (out_dir / shard['file']).read_bytes()
+        if hashlib.sha256(content).hexdigest() != shard['hash']:
+            raise ValueError(f"Shard {shard['file']} does not match its manifest hash")
+        for creature in json.loads(content):
+            by_id[creature['id']] = creature
+    return [by_id[cid] for cid in manifest['order']]
+
+
+def write_json(creatures: List[Dict[str, Any]], output_path: str) -> Path:
+    """Write the creature list to one indented JSON file, creating its directory."""
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output, 'w') as f:
+        json.dump(creatures, f, indent=2)
+    return output
 
 
 def generate_id(name: str) -> str:
     """Generate a URL-friendly ID from creature name."""
-    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+    return ID_INVALID_RE.sub('-', name.lower()).strip('-')
 
 
 def sanitize_text(text: str) -> str:
@@ -32,12 +826,58 @@ def sanitize_text(text: str) -> str:
     if not text:
         return text
     # Replace newlines with spaces (PDF columns often break mid-word)
-    text = re.sub(r'\n+', ' ', text)
+    text = NEWLINES_RE.sub(' ', text)
     # Normalize multiple spaces
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     return text.strip()
 
 
+def parse_damage_dice(damage: str) -> List[Dict[str, Any]]:
+    """Split a damage string into dice groups, e.g. "2d8+6 piercing plus 1d6 fire".
+
+    Groups use the DiceGroup shape from src/utils/dice.ts (numDice, dieSize,
+    modifier, damageType); parts without dice are skipped, as they are there.
+    """
+    damage = WHITESPACE_RE.sub(' ', DAMAGE_ARTIFACT_RE.sub('', damage).replace('\n', ' ')).strip()
+    groups = []
+    for part in DAMAGE_PLUS_RE.split(damage):
+        match = DICE_TERM_RE.search(DAMAGE_JUNK_RE.sub(' ', part).strip())
+        if match:
+            groups.append({
+                'numDice': int(match.group(1)),
+                'dieSize': int(match.group(2)),
+                'modifier': int(match.group(3)) if match.group(3) else 0,
+                'damageType': (match.group(4) or '').strip(),
+            })
+    return groups
+
+
+def average_damage(groups: List[Dict[str, Any]]) -> Union[int, float]:
+    """Mean total of rolling every dice group once.
+
+    Whole averages are ints so the JSON reads 7 rather than 7.0; the rest are
+    always a multiple of 0.5.
+    """
+    average = sum(g['numDice'] * (g['dieSize'] + 1) / 2 + g['modifier'] for g in groups)
+    return int(average) if float(average).is_integer() else average
+
+
+def map_bonuses(bonus: int, traits: List[str]) -> List[int]:
+    """Attack bonus for the 1st, 2nd and 3rd Strike in a turn (agile: -4/-8)."""
+    agile = any('agile' in t.lower() for t in traits)
+    step = 4 if agile else 5
+    return [bonus, bonus - step, bonus - 2 * step]
+
+
+def action_cost(actions: Any) -> Dict[str, Any]:
+    """Normalize an ability's actions value to a kind plus actions spent from the turn."""
+    if actions in (1, 2, 3):
+        return {'kind': 'action', 'actions': actions}
+    if actions in ('reaction', 'free'):
+        return {'kind': actions, 'actions': 0}
+    return {'kind': 'passive', 'actions': 0}
+
+
 def clean_creature_name(name: str) -> str:
     """Remove sidebar text and other artifacts from creature names."""
     # If there's a newline, the real name is usually AFTER it
@@ -71,7 +911,7 @@ def sanitize_traits(traits: list) -> list:
             continue
 
         # Skip if it looks like garbage (all caps section headers, just numbers)
-        if re.match(r'^[A-Z]{4,}$', trait) or re.match(r'^\d+$', trait):
+        if ALL_CAPS_WORD_RE.match(trait) or DIGITS_RE.match(trait):
             continue
 
         cleaned.append(trait)
@@ -111,6 +951,44 @@ def sanitize_skills(skills: dict) -> dict:
     return cleaned
 
 
+def _skip_lap(stage: str):
+    """Stand-in for StageTimer.lap when not profiling."""
+
+
+class BlockType:
+    """A kind of statblock the parser can pick out of the book.
+
+    `keyword` is the header word ("GHOUL MARINE CREATURE 4"), `parse` turns
+    a block into a record (called as parse(parser, block, timer)), `plural`
+    names the output file and `schema` is its file in public/schemas.
+    """
+
+    def __init__(self, name: str, keyword: str, plural: str, parse, schema: Optional[str] = None):
+        self.name = name
+        self.keyword = keyword
+        self.plural = plural
+        self.parse = parse
+        self.schema = schema
+
+
+BLOCK_TYPES: Dict[str, BlockType] = {}
+KEYWORD_BLOCK_TYPES: Dict[str, str] = {}
+
+
+def register_block_type(block_type: BlockType):
+    """Make a block type available to --types; every enabled type shares one extraction pass."""
+    BLOCK_TYPES[block_type.name] = block_type
+    KEYWORD_BLOCK_TYPES[block_type.keyword] = block_type.name
+
+
+def block_output_path(output_path: str, block_type: BlockType) -> Path:
+    """Output file for a block type: -o for creatures, <plural>.json beside it otherwise."""
+    output = Path(output_path)
+    if block_type.name == 'creature':
+        return output
+    return output.with_name(block_type.plural + output.suffix)
+
+
 class SF2eStatblockParser:
     """Parse Starfinder 2e statblocks from PDF text."""
 
@@ -120,54 +998,315 @@ class SF2eStatblockParser:
     # Rarity keywords
     RARITIES = ['uncommon', 'rare', 'unique']
 
-    def __init__(self, pdf_path: str):
+    # Ability "names" that are really stat lines caught by SPECIAL_ABILITY_RE
+    STAT_LINE_NAMES = ('perception', 'languages', 'skills', 'speed', 'melee', 'ranged',
+                       'ac ', 'hp ', 'fort', 'str ', 'dex ', 'con ', 'int ', 'wis ', 'cha ')
+
+    ACTION_MAP = {
+        '[one-action]': 1,
+        '[two-actions]': 2,
+        '[three-actions]': 3,
+        '[reaction]': 'reaction',
+        '[free-action]': 'free'
+    }
+
+    # Limit to 10 abilities per creature
+    MAX_SPECIAL_ABILITIES = 10
+
+    # Page ranges handed to each worker; several per worker keeps the pool busy
+    # when some pages (dense tables, vector art) are much slower than others
+    CHUNKS_PER_JOB = 4
+
+    # Cap on pages per worker task and on queued tasks, which bounds how many
+    # extracted pages wait in memory for parsing to catch up
+    MAX_CHUNK_PAGES = 8
+    TASKS_IN_FLIGHT_PER_JOB = 2
+
+    # Text kept for the last statblock, which has no following header to end it
+    LAST_BLOCK_CHARS = 4000
+
+    def __init__(self, pdf_path: str, jobs: Optional[int] = None,
+                 cache: Optional[PageTextCache] = None, source: str = 'Alien Core',
+                 profile: Optional[ParseProfile] = None, block_budget: Optional[float] = None,
+                 prefilter: bool = True, validator: Optional[SchemaValidator] = None,
+                 block_types: Iterable[str] = ('creature',)):
         self.pdf_path = Path(pdf_path)
+        self.block_types = [BLOCK_TYPES[name] for name in block_types]
+        self.enabled_types = {bt.name for bt in self.block_types}
+        # Every registered keyword ends a block, even of types that aren't
+        # parsed; otherwise a hazard would run on into the next creature.
+        # The page prefilter looks for the same headers.
+        self.header_keywords = [bt.keyword for bt in BLOCK_TYPES.values()]
+        self.header_re = block_header_re(self.header_keywords)
+        # Parsed records of every enabled type except creatures, which stream
+        self.records: Dict[str, List[Dict[str, Any]]] = {
+            bt.name: [] for bt in self.block_types if bt.name != 'creature'}
+        self.prefilter = prefilter
+        self.validator = validator
+        self.source = source
+        self.jobs = jobs or default_jobs()
+        self.cache = cache
+        self.profile = profile
+        self.block_budget = block_budget
         self.creatures: List[Dict[str, Any]] = []
+        self._pdf_hash: Optional[str] = None
+        # Set by BatchParser to share one worker pool between books
+        self.queue: Optional[ExtractionQueue] = None
+        # (start_page, end_page, wanted, missing) per range queued on `queue`,
+        # in the order it will extract them
+        self._plans: deque = deque()
+        # Statblocks per iter_creatures status, across runs
+        self.stats: Dict[str, int] = {}
+
+    @property
+    def pdf_hash(self) -> str:
+        """SHA-256 of the PDF, computed once per parser."""
+        if self._pdf_hash is None:
+            self._pdf_hash = file_sha256(self.pdf_path)
+        return self._pdf_hash
+
+    def _cached_pages(self, pages: List[int]) -> Dict[int, str]:
+        """Look up pages in the text cache, returning the hits."""
+        if not self.cache:
+            return {}
+        found = {}
+        for i in pages:
+            text = self.cache.get(self.pdf_hash, i)
+            if text is not None:
+                found[i] = text
+        return found
+
+    def _store_pages(self, texts: Dict[int, str]):
+        """Write freshly extracted pages to the text cache."""
+        if not self.cache or not texts:
+            return
+        for i, text in texts.items():
+            self.cache.put(self.pdf_hash, i, text)
+        self.cache.evict()
+
+    def page_count(self) -> int:
+        """Number of pages in the PDF."""
+        with load_pdfplumber().open(self.pdf_path) as pdf:
+            return len(pdf.pages)
 
     def extract_text_by_page(self, start_page: int = 0, end_page: Optional[int] = None) -> List[str]:
-        """Extract text from PDF pages, returning list of page texts."""
-        pages_text = []
-
-        with pdfplumber.open(self.pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            end = min(end_page or total_pages, total_pages)
-
-            print(f"Extracting pages {start_page + 1} to {end} of {total_pages}...")
-
-            for i in range(start_page, end):
-                if i % 20 == 0:
-                    print(f"  Processing page {i + 1}...")
-                text = pdf.pages[i].extract_text() or ""
-                pages_text.append(text)
-
-        return pages_text
+        """Extract text from PDF pages, returning list of page texts in page order."""
+        return [text for _, text in self.iter_page_texts(start_page, end_page)]
+
+    def plan_extraction(self, start_page: int = 0, end_page: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        """Decide which pages to read and which of them need extracting.
+
+        Returns (wanted, missing). With a shared queue the missing pages are
+        queued right away, so a batch can plan every book before reading any.
+        """
+        total_pages = self.page_count()
+        end = min(end_page or total_pages, total_pages)
+        wanted = list(range(start_page, end))
+
+        print(f"Extracting pages {start_page + 1} to {end} of {total_pages}...")
+
+        if self.prefilter:
+            scanned = scan_statblock_pages(str(self.pdf_path), start_page, end, self.header_keywords)
+            if scanned is not None:
+                skipped = len(wanted) - len(scanned)
+                print(f"  Prefilter: skipping {skipped}/{len(wanted)} pages outside statblocks")
+                if self.profile:
+                    self.profile.skipped_pages += skipped
+                wanted = scanned
+
+        if self.cache:
+            missing = [i for i in wanted if not self.cache.contains(self.pdf_hash, i)]
+            print(f"  {len(wanted) - len(missing)}/{len(wanted)} pages from cache ({self.cache.cache_dir})")
+        else:
+            missing = list(wanted)
+
+        if self.queue:
+            self.queue.add(str(self.pdf_path), self._page_ranges(missing, self.jobs))
+            self._plans.append((start_page, end_page, wanted, missing))
+        return wanted, missing
+
+    def iter_page_texts(self, start_page: int = 0, end_page: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (page index, text) in page order, extracting pages lazily.
+
+        Cached pages are read as they are reached and the rest are extracted
+        by a bounded window of worker tasks, so only a handful of pages are
+        held in memory at once.
+        """
+        # A range planned ahead is read in the order it was queued, even when
+        # the same range was queued more than once
+        if self._plans and self._plans[0][:2] == (start_page, end_page):
+            wanted, missing = self._plans.popleft()[2:]
+        else:
+            wanted, missing = self.plan_extraction(start_page, end_page)
+        missing_set = set(missing)
+        extracted = self._iter_extracted(missing)
+
+        for i in wanted:
+            waited = time.perf_counter()
+            seconds = 0.0
+            if i not in missing_set:
+                text = self.cache.get(self.pdf_hash, i)
+                if text is None:
+                    # Evicted by another run since we checked
+                    text, seconds = self._extract_page(i)
+                    self.cache.put(self.pdf_hash, i, text)
+            else:
+                page, text, seconds = next(extracted)
+                assert page == i, f"extracted page {page} out of order (expected {i})"
+                if self.cache:
+                    self.cache.put(self.pdf_hash, i, text)
+            if self.profile:
+                self.profile.page_wait_seconds += time.perf_counter() - waited
+                self.profile.add_page(i, seconds, cached=i not in missing_set)
+            yield i, text
+
+        # Let the extractor finish (and report its throughput)
+        for _ in extracted:
+            pass
+        if self.cache and missing:
+            self.cache.evict()
+
+    def _extract_page(self, page: int) -> Tuple[str, float]:
+        """Extract a single page in this process, returning (text, seconds)."""
+        return _extract_page_range(str(self.pdf_path), page, page + 1)[0]
+
+    def _iter_extracted(self, pages: List[int]) -> Iterator[Tuple[int, str, float]]:
+        """Run pdfplumber over the given pages, yielding (page, text, seconds) in order.
+
+        With jobs > 1 (or a shared queue) the pages are split into small
+        ranges and a few ranges per worker are kept in flight; results are
+        yielded as the head of the queue completes, so extraction overlaps
+        with downstream parsing.
+        """
+        if not pages:
+            return
+
+        page_count = len(pages)
+        jobs = max(1, min(self.jobs, page_count))
+        print(f"  Extracting {page_count} pages ({jobs} job{'s' if jobs != 1 else ''})...")
+
+        started = time.perf_counter()
+        done = 0
+        if self.queue:
+            # Ranges were queued by plan_extraction
+            yield from self._drain_queue(self.queue, page_count, started)
+        elif jobs == 1:
+            with load_pdfplumber().open(self.pdf_path) as pdf:
+                for i in pages:
+                    page_started = time.perf_counter()
+                    text = pdf.pages[i].extract_text() or ""
+                    yield i, text, time.perf_counter() - page_started
+                    done += 1
+                    if done % 20 == 0:
+                        self._report_progress(done, page_count, started)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                queue = ExtractionQueue(pool, jobs * self.TASKS_IN_FLIGHT_PER_JOB)
+                queue.add(str(self.pdf_path), self._page_ranges(pages, jobs))
+                yield from self._drain_queue(queue, page_count, started)
+
+        elapsed = time.perf_counter() - started
+        rate = page_count / elapsed if elapsed > 0 else 0.0
+        print(f"Extracted {page_count} pages in {elapsed:.1f}s ({rate:.1f} pages/s)")
+
+    @classmethod
+    def _page_ranges(cls, pages: List[int], jobs: int) -> List[tuple]:
+        """Split pages into the contiguous ranges handed to workers."""
+        jobs = max(1, min(jobs, len(pages)))
+        chunks = max(jobs * cls.CHUNKS_PER_JOB, -(-len(pages) // cls.MAX_CHUNK_PAGES))
+        return chunk_pages(pages, chunks)
+
+    def _drain_queue(self, queue: ExtractionQueue, page_count: int,
+                     started: float) -> Iterator[Tuple[int, str, float]]:
+        """Yield (page, text, seconds) for this PDF's queued ranges as they complete."""
+        done = 0
+        while done < page_count:
+            lo, texts = queue.next_range(str(self.pdf_path))
+            before = done
+            for offset, (text, seconds) in enumerate(texts):
+                yield lo + offset, text, seconds
+            done += len(texts)
+            if done // 20 > before // 20:
+                self._report_progress(done, page_count, started)
+
+    @staticmethod
+    def _report_progress(done: int, total: int, started: float):
+        """Print extraction progress with throughput."""
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        print(f"  {done}/{total} pages ({rate:.1f} pages/s)")
 
     def find_creature_blocks(self, text: str) -> List[Dict[str, Any]]:
         """Find all creature statblock starts in text."""
-        # Pattern: NAME CREATURE LEVEL (where NAME is in caps or title case)
-        # e.g., "YEARLING ARABUK CREATURE 3" or "Aeon Guard Commander CREATURE 8"
-        pattern = r'([A-Z][A-Za-z\s\'-]+?)\s+CREATURE\s+(\d+)\s*\n'
-
-        matches = list(re.finditer(pattern, text))
-        blocks = []
-
-        for i, match in enumerate(matches):
-            raw_name = match.group(1).strip()
-            level = int(match.group(2))
-            start = match.start()
-            # End at next creature or 3000 chars (reasonable statblock length)
-            end = matches[i + 1].start() if i + 1 < len(matches) else min(start + 4000, len(text))
-
+        return [b for b in self.iter_blocks([(0, text)]) if b['type'] == 'creature']
+
+    def iter_blocks(self, pages: Iterable[Tuple[int, str]]) -> Iterator[Dict[str, Any]]:
+        """Find statblocks of every enabled type in a stream of (page index, text) pages.
+
+        Headers of every registered type end the open block, but only blocks
+        of enabled types are yielded. Yields the same blocks as a single scan of the pages joined with
+        blank lines, but each block is yielded as soon as the next header ends
+        it. Only text from the open block's header (or from the last point a
+        header could still begin) is kept, so statblocks that cross a page
+        boundary still work without holding the whole book.
+        """
+        buf = ''
+        base = 0            # offset of buf[0] in the joined text
+        scan_from = 0       # joined offset where the next header search starts
+        page_starts: List[Tuple[int, int]] = []   # (joined offset, page index)
+        current = None
+
+        for page, text in pages:
+            if page_starts:
+                buf += '\n\n'
+            page_starts.append((base + len(buf), page))
+            buf += text
+
+            # Header starts and groups are final once found; more text can
+            # only lengthen a match's trailing whitespace
+            # Pattern: NAME CREATURE LEVEL (where NAME is in caps or title case)
+            # e.g., "YEARLING ARABUK CREATURE 3" or "Aeon Guard Commander CREATURE 8"
+            for match in self.header_re.finditer(buf, scan_from - base):
+                start = base + match.start()
+                if current and current['type'] in self.enabled_types:
+                    current['text'] = buf[current['start'] - base:match.start()]
+                    yield self._finish_block(current)
+                offsets = [offset for offset, _ in page_starts]
+                current = {
+                    'start': start,
+                    'raw_name': match.group(1),
+                    'type': KEYWORD_BLOCK_TYPES[match.group(2)],
+                    'level': int(match.group(3)),
+                    'page': page_starts[bisect_right(offsets, start) - 1][1],
+                }
+                scan_from = base + match.end()
+
+            # A header split across the page boundary can't begin before this
+            scan_from = max(scan_from, base + header_tail_start(buf, scan_from - base))
+
+            keep = min(scan_from, current['start']) if current else scan_from
+            if keep > base:
+                buf = buf[keep - base:]
+                base = keep
+                while len(page_starts) > 1 and page_starts[1][0] <= base:
+                    page_starts.pop(0)
+
+        if current and current['type'] in self.enabled_types:
+            offset = current['start'] - base
+            current['text'] = buf[offset:offset + self.LAST_BLOCK_CHARS]
+            yield self._finish_block(current)
+
+    @staticmethod
+    def _finish_block(header: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a block dict from a header and its collected text."""
+        return {
             # Clean up the creature name (remove sidebar text artifacts)
-            cleaned_name = clean_creature_name(raw_name)
-
-            blocks.append({
-                'name': cleaned_name,
-                'level': level,
-                'text': text[start:end]
-            })
-
-        return blocks
+            'name': clean_creature_name(header['raw_name'].strip()),
+            'type': header['type'],
+            'level': header['level'],
+            'text': header['text'],
+            'page': header['page'],
+        }
 
     def parse_traits(self, text: str) -> tuple:
         """Extract size, rarity, and other traits from first few lines."""
@@ -207,9 +1346,10 @@ class SF2eStatblockParser:
 
         return size, traits
 
-    def parse_perception(self, text: str) -> tuple:
+    def parse_perception(self, text: str, sections: Optional[StatblockSections] = None) -> tuple:
         """Extract perception bonus and senses."""
-        match = re.search(r'Perception\s+([+-]?\d+)(?:[;,]\s*(.+?))?(?=\n|Languages|Skills)', text, re.IGNORECASE)
+        sections = sections or StatblockSections(text)
+        match = sections.search('perception', PERCEPTION_RE)
         if match:
             perception = int(match.group(1))
             senses_text = match.group(2) or ''
@@ -217,9 +1357,10 @@ class SF2eStatblockParser:
             return perception, senses
         return 0, []
 
-    def parse_languages(self, text: str) -> List[str]:
+    def parse_languages(self, text: str, sections: Optional[StatblockSections] = None) -> List[str]:
         """Extract languages."""
-        match = re.search(r'Languages\s+(.+?)(?=\n|Skills)', text, re.IGNORECASE)
+        sections = sections or StatblockSections(text)
+        match = sections.search('languages', LANGUAGES_RE)
         if match:
             langs = match.group(1).strip()
             if langs.lower() == 'none':
@@ -227,31 +1368,32 @@ class SF2eStatblockParser:
             return [l.strip() for l in langs.split(',') if l.strip()]
         return []
 
-    def parse_skills(self, text: str) -> Dict[str, int]:
+    def parse_skills(self, text: str, sections: Optional[StatblockSections] = None) -> Dict[str, int]:
         """Extract skills and their modifiers."""
+        sections = sections or StatblockSections(text)
         skills = {}
-        match = re.search(r'Skills\s+(.+?)(?=\nStr|$)', text, re.IGNORECASE | re.DOTALL)
+        match = sections.search('skills', SKILLS_RE)
         if match:
-            skills_text = match.group(1)
             # Match patterns like "Acrobatics +21" or "Athletics +20"
-            skill_pattern = r'([A-Za-z][A-Za-z\s]+?)\s+([+-]\d+)'
-            for skill_match in re.finditer(skill_pattern, skills_text):
+            for skill_match in SKILL_ENTRY_RE.finditer(match.group(1)):
                 skill_name = skill_match.group(1).strip()
                 skill_value = int(skill_match.group(2))
                 skills[skill_name] = skill_value
         return skills
 
-    def parse_abilities(self, text: str) -> Dict[str, int]:
+    def parse_abilities(self, text: str, sections: Optional[StatblockSections] = None) -> Dict[str, int]:
         """Extract ability modifiers."""
+        sections = sections or StatblockSections(text)
         abilities = {'str': 0, 'dex': 0, 'con': 0, 'int': 0, 'wis': 0, 'cha': 0}
-        for ability in abilities.keys():
-            match = re.search(rf'\b{ability}\s+([+-]?\d+)', text, re.IGNORECASE)
+        for ability, pattern in ABILITY_RES.items():
+            match = sections.search(ability, pattern)
             if match:
                 abilities[ability] = int(match.group(1))
         return abilities
 
-    def parse_defenses(self, text: str) -> Dict[str, Any]:
+    def parse_defenses(self, text: str, sections: Optional[StatblockSections] = None) -> Dict[str, Any]:
         """Extract AC, saves, HP, immunities, resistances, weaknesses."""
+        sections = sections or StatblockSections(text)
         defenses = {
             'ac': 0,
             'saves': {'fort': 0, 'ref': 0, 'will': 0},
@@ -262,89 +1404,76 @@ class SF2eStatblockParser:
         }
 
         # AC
-        ac_match = re.search(r'AC\s+(\d+)', text, re.IGNORECASE)
+        ac_match = sections.search('ac', AC_RE)
         if ac_match:
             defenses['ac'] = int(ac_match.group(1))
 
         # Saves
-        for save in ['fort', 'ref', 'will']:
-            match = re.search(rf'{save}\s+([+-]?\d+)', text, re.IGNORECASE)
+        for save, pattern in SAVE_RES.items():
+            match = sections.search(save, pattern)
             if match:
                 defenses['saves'][save] = int(match.group(1))
 
         # HP
-        hp_match = re.search(r'HP\s+(\d+)', text, re.IGNORECASE)
+        hp_match = sections.search('hp', HP_RE)
         if hp_match:
             defenses['hp'] = int(hp_match.group(1))
 
         # Immunities
-        imm_match = re.search(r'Immunities\s+(.+?)(?=;|Resistances|Weaknesses|Speed|\n\n)', text, re.IGNORECASE)
+        imm_match = sections.search('immunities', IMMUNITIES_RE)
         if imm_match:
             defenses['immunities'] = [i.strip() for i in imm_match.group(1).split(',') if i.strip()]
 
         # Resistances
-        res_match = re.search(r'Resistances\s+(.+?)(?=;|Weaknesses|Speed|\n\n)', text, re.IGNORECASE)
+        res_match = sections.search('resistances', RESISTANCES_RE)
         if res_match:
             defenses['resistances'] = [r.strip() for r in res_match.group(1).split(',') if r.strip()]
 
         # Weaknesses
-        weak_match = re.search(r'Weaknesses\s+(.+?)(?=;|Speed|\n\n)', text, re.IGNORECASE)
+        weak_match = sections.search('weaknesses', WEAKNESSES_RE)
         if weak_match:
             defenses['weaknesses'] = [w.strip() for w in weak_match.group(1).split(',') if w.strip()]
 
         return defenses
 
-    def parse_speed(self, text: str) -> str:
+    def parse_speed(self, text: str, sections: Optional[StatblockSections] = None) -> str:
         """Extract speed."""
-        match = re.search(r'Speed\s+(.+?)(?=\n|Melee|Ranged)', text, re.IGNORECASE)
+        sections = sections or StatblockSections(text)
+        match = sections.search('speed', SPEED_RE)
         if match:
             speed = sanitize_text(match.group(1))
             # Remove any trailing garbage that's clearly not speed info
-            speed = re.sub(r'\s+(to arcane|such as|Caypin|[A-Z][a-z]+\s+CREATURE).*$', '', speed, flags=re.IGNORECASE)
+            speed = SPEED_TRAILING_RE.sub('', speed)
             return speed
         return '25 feet'
 
-    def parse_attacks(self, text: str) -> List[Dict[str, Any]]:
+    def parse_attacks(self, text: str, sections: Optional[StatblockSections] = None) -> List[Dict[str, Any]]:
         """Extract melee and ranged attacks."""
+        sections = sections or StatblockSections(text)
         attacks = []
 
-        # Melee attacks: Melee [one-action] name +X (traits), Damage XdX+X type
-        melee_pattern = r'Melee\s+\[one-action\]\s*([^+]+?)\s+([+-]\d+)\s*(?:\(([^)]+)\))?,?\s*Damage\s+([^\n;]+)'
-        for match in re.finditer(melee_pattern, text, re.IGNORECASE):
-            name = sanitize_text(match.group(1))
-            bonus = int(match.group(2))
-            traits_str = match.group(3) or ''
-            traits = [t.strip() for t in traits_str.split(',') if t.strip()]
-            traits = sanitize_traits(traits)
-            damage = sanitize_text(match.group(4))
-
-            attacks.append({
-                'name': name,
-                'type': 'melee',
-                'bonus': bonus,
-                'damage': damage,
-                'traits': traits,
-                'actions': 1
-            })
-
-        # Ranged attacks
-        ranged_pattern = r'Ranged\s+\[one-action\]\s*([^+]+?)\s+([+-]\d+)\s*(?:\(([^)]+)\))?,?\s*Damage\s+([^\n;]+)'
-        for match in re.finditer(ranged_pattern, text, re.IGNORECASE):
-            name = sanitize_text(match.group(1))
-            bonus = int(match.group(2))
-            traits_str = match.group(3) or ''
-            traits = [t.strip() for t in traits_str.split(',') if t.strip()]
-            traits = sanitize_traits(traits)
-            damage = sanitize_text(match.group(4))
-
-            attacks.append({
-                'name': name,
-                'type': 'ranged',
-                'bonus': bonus,
-                'damage': damage,
-                'traits': traits,
-                'actions': 1
-            })
+        for attack_type, pattern in (('melee', MELEE_RE), ('ranged', RANGED_RE)):
+            for match in sections.finditer(attack_type, pattern):
+                name = sanitize_text(match.group(1))
+                bonus = int(match.group(2))
+                traits_str = match.group(3) or ''
+                traits = [t.strip() for t in traits_str.split(',') if t.strip()]
+                traits = sanitize_traits(traits)
+                damage = sanitize_text(match.group(4))
+
+                dice = parse_damage_dice(damage)
+                attacks.append({
+                    'name': name,
+                    'type': attack_type,
+                    'bonus': bonus,
+                    'damage': damage,
+                    'traits': traits,
+                    'actions': 1,
+                    # Precomputed so the app can render and roll without re-parsing
+                    'damageDice': dice,
+                    'averageDamage': average_damage(dice),
+                    'mapBonuses': map_bonuses(bonus, traits),
+                })
 
         return attacks
 
@@ -352,31 +1481,21 @@ class SF2eStatblockParser:
         """Extract special abilities."""
         abilities = []
 
-        # Look for ability patterns: Name [action-type] (traits) Description
-        # or Name Description (for passive abilities)
-        ability_pattern = r'\n([A-Z][A-Za-z\s\']+)\s+(\[(?:one-action|two-actions|three-actions|reaction|free-action)\])?\s*(?:\(([^)]+)\))?\s+([A-Z][^.]+\.(?:[^.]+\.)*)'
-
-        for match in re.finditer(ability_pattern, text):
+        for match in SPECIAL_ABILITY_RE.finditer(text):
             name = match.group(1).strip()
             action_type = match.group(2)
             traits_str = match.group(3) or ''
             description = match.group(4).strip()
 
             # Skip if this looks like a stat line
-            if any(skip in name.lower() for skip in ['perception', 'languages', 'skills', 'speed', 'melee', 'ranged', 'ac ', 'hp ', 'fort', 'str ', 'dex ', 'con ', 'int ', 'wis ', 'cha ']):
+            lower_name = name.lower()
+            if any(skip in lower_name for skip in self.STAT_LINE_NAMES):
                 continue
 
             # Convert action type
             actions = None
             if action_type:
-                action_map = {
-                    '[one-action]': 1,
-                    '[two-actions]': 2,
-                    '[three-actions]': 3,
-                    '[reaction]': 'reaction',
-                    '[free-action]': 'free'
-                }
-                actions = action_map.get(action_type.lower())
+                actions = self.ACTION_MAP.get(action_type.lower())
 
             traits = [t.strip() for t in traits_str.split(',') if t.strip()] if traits_str else []
 
@@ -388,14 +1507,18 @@ class SF2eStatblockParser:
                 ability['actions'] = actions
             if traits:
                 ability['traits'] = traits
+            ability['actionCost'] = action_cost(actions)
 
             abilities.append(ability)
+            if len(abilities) == self.MAX_SPECIAL_ABILITIES:
+                break
 
-        return abilities[:10]  # Limit to 10 abilities per creature
+        return abilities
 
-    def parse_items(self, text: str) -> List[str]:
+    def parse_items(self, text: str, sections: Optional[StatblockSections] = None) -> List[str]:
         """Extract items/equipment."""
-        match = re.search(r'Items\s+(.+?)(?=\nAC|\n\n)', text, re.IGNORECASE)
+        sections = sections or StatblockSections(text)
+        match = sections.search('items', ITEMS_RE)
         if match:
             items_text = match.group(1).strip()
             # Split by comma but be careful with parentheses
@@ -418,22 +1541,40 @@ class SF2eStatblockParser:
             return items
         return []
 
-    def parse_statblock(self, block: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse a single statblock into structured data."""
+    def parse_statblock(self, block: Dict[str, Any], timer: Optional[StageTimer] = None) -> Dict[str, Any]:
+        """Parse a single statblock into structured data.
+
+        Pass a StageTimer to record how long each parse_* stage takes.
+        """
         text = block['text']
         name = block['name']
         level = block['level']
+        lap = timer.lap if timer else _skip_lap
+
+        # Locate every field label once; each parser reads only its sections
+        sections = StatblockSections(text)
+        lap('segment')
 
         size, traits = self.parse_traits(text)
-        perception, senses = self.parse_perception(text)
-        languages = self.parse_languages(text)
-        skills = sanitize_skills(self.parse_skills(text))  # Apply sanitization
-        abilities = self.parse_abilities(text)
-        defenses = self.parse_defenses(text)
-        speed = self.parse_speed(text)
-        attacks = self.parse_attacks(text)
+        lap('parse_traits')
+        perception, senses = self.parse_perception(text, sections)
+        lap('parse_perception')
+        languages = self.parse_languages(text, sections)
+        lap('parse_languages')
+        skills = sanitize_skills(self.parse_skills(text, sections))  # Apply sanitization
+        lap('parse_skills')
+        abilities = self.parse_abilities(text, sections)
+        lap('parse_abilities')
+        defenses = self.parse_defenses(text, sections)
+        lap('parse_defenses')
+        speed = self.parse_speed(text, sections)
+        lap('parse_speed')
+        attacks = self.parse_attacks(text, sections)
+        lap('parse_attacks')
         special_abilities = self.parse_special_abilities(text)
-        items = self.parse_items(text)
+        lap('parse_special_abilities')
+        items = self.parse_items(text, sections)
+        lap('parse_items')
 
         # Sanitize senses and languages too
         senses = [sanitize_text(s) for s in senses if s]
@@ -445,7 +1586,7 @@ class SF2eStatblockParser:
             'level': level,
             'traits': traits,
             'size': size,
-            'source': 'Alien Core',
+            'source': self.source,
             'perception': perception,
             'senses': senses,
             'languages': languages,
@@ -467,59 +1608,446 @@ class SF2eStatblockParser:
 
         return creature
 
-    def parse_pdf(self, start_page: int = 0, end_page: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Parse the PDF and extract all creatures."""
-        print(f"Opening PDF: {self.pdf_path}")
+    def parse_hazard_traits(self, text: str) -> List[str]:
+        """Trait words from the all-caps lines under a hazard header."""
+        traits = []
+        for line in text.split('\n')[1:4]:
+            line = line.strip()
+            if not HAZARD_TRAIT_LINE_RE.match(line):
+                break
+            traits.extend(word.title() for word in line.split())
+        return traits
 
-        pages_text = self.extract_text_by_page(start_page, end_page)
-        full_text = '\n\n'.join(pages_text)
+    def parse_hazard_actions(self, text: str) -> List[Dict[str, Any]]:
+        """Reactions and actions, split into trigger and effect where given.
 
-        print("Finding creature statblocks...")
-        blocks = self.find_creature_blocks(full_text)
-        print(f"Found {len(blocks)} potential creatures")
+        Dice damage in the effect is also kept on its own, as text and as
+        precomputed dice groups, so the combat tracker can roll it.
+        """
+        actions = []
+        for match in HAZARD_ACTION_RE.finditer(text):
+            name = sanitize_text(match.group(1))
+            if name.lower() in ('melee', 'ranged'):
+                continue
+            body = match.group(4)
+            trigger_effect = TRIGGER_EFFECT_RE.match(body)
+            action = {
+                'name': name,
+                'actionType': self.ACTION_MAP[match.group(2).lower()],
+            }
+            if trigger_effect:
+                action['trigger'] = sanitize_text(trigger_effect.group(1))
+                action['effect'] = sanitize_text(trigger_effect.group(2))
+            else:
+                action['effect'] = sanitize_text(body)
+            if match.group(3):
+                action['traits'] = [t.strip() for t in match.group(3).split(',') if t.strip()]
+            damage = HAZARD_DAMAGE_RE.search(action['effect'])
+            if damage:
+                action['damage'] = DAMAGE_WORD_RE.sub('', damage.group(0))
+                action['damageDice'] = parse_damage_dice(action['damage'])
+            actions.append(action)
+        return actions
+
+    def parse_hazard(self, block: Dict[str, Any], timer: Optional[StageTimer] = None) -> Dict[str, Any]:
+        """Parse a HAZARD statblock into the shape of src/data/hazards.json."""
+        text = block['text']
+        lap = timer.lap if timer else _skip_lap
+
+        traits = self.parse_hazard_traits(text)
+        lower_traits = [t.lower() for t in traits]
+        if 'haunt' in lower_traits:
+            hazard_type = 'haunt'
+        elif 'environmental' in lower_traits:
+            hazard_type = 'environmental'
+        else:
+            hazard_type = 'trap'
+        lap('parse_hazard_traits')
+
+        hazard: Dict[str, Any] = {
+            'id': generate_id(block['name']),
+            'name': block['name'],
+            'level': block['level'],
+            'complexity': 'complex' if 'complex' in lower_traits else 'simple',
+            'type': hazard_type,
+            'traits': [t for t in traits if t.lower() not in ('simple', 'complex')],
+            'source': self.source,
+        }
+        subtypes = [t for t in ('mechanical', 'magical', 'tech') if t in lower_traits]
+        if hazard_type == 'trap' and subtypes:
+            hazard['trapSubtypes'] = subtypes
+
+        description = DESCRIPTION_RE.search(text)
+        hazard['description'] = sanitize_text(description.group(1)) if description else ''
+
+        stealth = STEALTH_RE.search(text)
+        if stealth:
+            hazard['stealth'] = sanitize_text(stealth.group(1))
+            dc = STEALTH_DC_RE.search(stealth.group(1))
+            if dc:
+                # "Stealth +12" is a modifier; the DC to find it is 10 higher
+                hazard['stealthDC'] = int(dc.group(2)) + (0 if dc.group(1) else 10)
+        disable = DISABLE_RE.search(text)
+        if disable:
+            hazard['disable'] = sanitize_text(disable.group(1))
+        lap('parse_hazard_detection')
+
+        # Saves only come from the AC line so "Reflex save" in an effect can't match
+        defense_line = HAZARD_DEFENSE_LINE_RE.search(text)
+        if defense_line:
+            line = defense_line.group(0)
+            hazard['ac'] = int(AC_RE.search(line).group(1))
+            saves = {}
+            for save, key in (('fort', 'fortitude'), ('ref', 'reflex'), ('will', 'will')):
+                match = SAVE_RES[save].search(line)
+                if match:
+                    saves[key] = int(match.group(1))
+            hazard['saves'] = saves
+        hp_line = HAZARD_HP_LINE_RE.search(text)
+        if hp_line:
+            line = hp_line.group(0)
+            for key, pattern in (('hardness', HARDNESS_RE), ('hp', HP_RE), ('bt', BT_RE)):
+                match = pattern.search(line)
+                if match:
+                    hazard[key] = int(match.group(1))
+            immunities = IMMUNITIES_RE.search(line + '\n\n')
+            if immunities:
+                hazard['immunities'] = [i.strip() for i in immunities.group(1).split(',') if i.strip()]
+        lap('parse_hazard_defenses')
 
+        attacks = self.parse_attacks(text)
+        if attacks:
+            hazard['attackBonus'] = attacks[0]['bonus']
+            hazard['damage'] = attacks[0]['damage']
+        hazard['actions'] = self.parse_hazard_actions(text)
+        routine = ROUTINE_RE.search(text)
+        if routine:
+            hazard['actionsPerRound'] = int(routine.group(1))
+            hazard['routine'] = sanitize_text(routine.group(2))
+        reset = RESET_RE.search(text)
+        if reset:
+            hazard['reset'] = sanitize_text(reset.group(1))
+        lap('parse_hazard_actions')
+
+        return hazard
+
+    def iter_creatures(self, start_page: int = 0, end_page: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Parse the PDF, yielding each creature as soon as its statblock is complete."""
+        creatures = self._iter_parsed(start_page, end_page)
+        return self.validator.run(creatures) if self.validator else creatures
+
+    def _iter_parsed(self, start_page: int, end_page: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Parse every enabled block type, yielding creatures and keeping the rest in self.records."""
+        print(f"Opening PDF: {self.pdf_path}")
+
+        pages = self.iter_page_texts(start_page, end_page)
+        found: Dict[str, int] = {bt.name: 0 for bt in self.block_types}
         seen_ids = set()
-        for block in blocks:
+        for block in self.iter_blocks(pages):
+            kind = block['type']
+            found[kind] += 1
+            timer = StageTimer() if self.profile else None
+            started = time.perf_counter()
+            status = 'parsed'
             try:
-                creature = self.parse_statblock(block)
-                # Skip duplicates (same name)
-                if creature['id'] in seen_ids:
-                    continue
-                seen_ids.add(creature['id'])
-
-                self.creatures.append(creature)
-                print(f"  Parsed: {creature['name']} (Level {creature['level']}) - AC {creature['ac']}, HP {creature['hp']}")
+                with time_budget(self.block_budget):
+                    record = BLOCK_TYPES[kind].parse(self, block, timer)
+            except BlockBudgetExceeded:
+                print(f"  Warning: Skipped {block['name']} (page {block['page'] + 1}): "
+                      f"over the {self.block_budget}s block budget")
+                status = 'over_budget'
             except Exception as e:
                 print(f"  Warning: Failed to parse {block['name']}: {e}")
+                status = 'failed'
+            else:
+                # Skip duplicates (same name)
+                if (kind, record['id']) in seen_ids:
+                    status = 'duplicate'
+                seen_ids.add((kind, record['id']))
+
+            if kind == 'creature':
+                self.stats[status] = self.stats.get(status, 0) + 1
+            if self.profile:
+                self.profile.add_block(block, status, time.perf_counter() - started,
+                                       timer.stages)
+            if status != 'parsed':
+                continue
+
+            if kind == 'creature':
+                print(f"  Parsed: {record['name']} (Level {record['level']}) - AC {record['ac']}, HP {record['hp']}")
+                yield record
+            else:
+                print(f"  Parsed {kind}: {record['name']} (Level {record['level']})")
+                self.records[kind].append(record)
+
+        print("Found " + ', '.join(f"{count} potential {BLOCK_TYPES[kind].plural}"
+                                   for kind, count in found.items()))
 
+    def parse_pdf(self, start_page: int = 0, end_page: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Parse the PDF and extract all creatures."""
+        self.creatures.extend(self.iter_creatures(start_page, end_page))
         return self.creatures
 
     def save_json(self, output_path: str):
         """Save creatures to JSON file."""
+        output = write_json(self.creatures, output_path)
+        print(f"\nSaved {len(self.creatures)} creatures to {output}")
+
+    def merge_json(self, output_path: str, full_range: bool = True) -> Dict[str, int]:
+        """Merge parsed creatures into an existing JSON file, matched by id.
+
+        Unchanged entries keep their exact bytes and position, changed ones
+        are rewritten in place and new ones are appended. Entries from this
+        parser's source that weren't parsed are removed only when the whole
+        book was parsed (full_range), so a --start/--end run never drops
+        creatures outside its pages. The file isn't touched if nothing changed.
+        """
+        output = Path(output_path)
+        existing = read_json_entries(output) if output.exists() else []
+
+        parsed = {c['id']: c for c in self.creatures}
+        stats = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+
+        entries = []
+        merged_ids = set()
+        for creature, raw in existing:
+            cid = creature.get('id')
+            new = parsed.get(cid)
+            if new is None:
+                if full_range and creature.get('source') == self.source:
+                    stats['removed'] += 1
+                    continue
+                entries.append(raw)
+            elif cid in merged_ids:
+                # Keep duplicate ids from the existing file as they were
+                entries.append(raw)
+            elif creature_hash(new) == creature_hash(creature):
+                stats['unchanged'] += 1
+                entries.append(raw)
+            else:
+                stats['changed'] += 1
+                entries.append(format_json_entry(new))
+            if new is not None:
+                merged_ids.add(cid)
+
+        for cid, creature in parsed.items():
+            if cid not in merged_ids:
+                stats['added'] += 1
+                entries.append(format_json_entry(creature))
+
+        summary = ', '.join(f"{count} {kind}" for kind, count in stats.items())
+        if output.exists() and not (stats['added'] or stats['changed'] or stats['removed']):
+            print(f"\nNo changes to {output} ({summary})")
+            return stats
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        content = '[\n  ' + ',\n  '.join(entries) + '\n]' if entries else '[]'
+        output.write_text(content, encoding='utf-8')
+        print(f"\nMerged into {output}: {summary}")
+        return stats
+
+    @staticmethod
+    def write_ndjson(creatures: Iterable[Dict[str, Any]], output_path: str) -> int:
+        """Write creatures one per line as they arrive; returns the count.
+
+        Each line is flushed immediately, so an interrupted run still leaves
+        every creature parsed so far in the file.
+        """
         output = Path(output_path)
         output.parent.mkdir(parents=True, exist_ok=True)
 
+        count = 0
         with open(output, 'w') as f:
-            json.dump(self.creatures, f, indent=2)
+            for creature in creatures:
+                f.write(json.dumps(creature) + '\n')
+                f.flush()
+                count += 1
 
-        print(f"\nSaved {len(self.creatures)} creatures to {output}")
+        print(f"\nSaved {count} creatures to {output}")
+        return count
 
     def preview_pages(self, page_nums: List[int]) -> str:
         """Preview specific pages."""
-        with pdfplumber.open(self.pdf_path) as pdf:
-            texts = []
-            for p in page_nums:
-                if 0 <= p < len(pdf.pages):
-                    text = pdf.pages[p].extract_text() or ""
-                    texts.append(f"\n{'='*60}\nPAGE {p + 1}\n{'='*60}\n{text}")
-            return "\n".join(texts)
+        with load_pdfplumber().open(self.pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+        valid = [p for p in page_nums if 0 <= p < total_pages]
+
+        pages = self._cached_pages(valid)
+        extracted = {}
+        if len(pages) < len(set(valid)):
+            with load_pdfplumber().open(self.pdf_path) as pdf:
+                for p in valid:
+                    if p not in pages and p not in extracted:
+                        extracted[p] = pdf.pages[p].extract_text() or ""
+        self._store_pages(extracted)
+        pages.update(extracted)
+
+        texts = []
+        for p in valid:
+            texts.append(f"\n{'='*60}\nPAGE {p + 1}\n{'='*60}\n{pages[p]}")
+        return "\n".join(texts)
+
+
+register_block_type(BlockType('creature', 'CREATURE', 'creatures',
+                              SF2eStatblockParser.parse_statblock, 'creatures.schema.json'))
+register_block_type(BlockType('hazard', 'HAZARD', 'hazards',
+                              SF2eStatblockParser.parse_hazard, 'hazards.schema.json'))
+
+
+def load_batch(path: str) -> List[Dict[str, Any]]:
+    """Read a batch file: a JSON list of books to parse in one run.
+
+    Each entry is {"pdf": ..., "source": ..., "ranges": [[start, end], ...]}.
+    "source" defaults to the PDF's file name, "ranges" to the whole book (or
+    a single "start"/"end" pair); pages are 0-indexed like --start/--end, and
+    relative PDF paths are resolved from the batch file's directory.
+    """
+    batch_path = Path(path)
+    entries = json.loads(batch_path.read_text(encoding='utf-8'))
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty list of books")
+
+    sources = []
+    for entry in entries:
+        if 'pdf' not in entry:
+            raise ValueError(f"{path}: batch entry without a \"pdf\": {entry}")
+        pdf = Path(entry['pdf'])
+        if not pdf.is_absolute():
+            pdf = batch_path.parent / pdf
+        ranges = entry.get('ranges') or [[entry.get('start', 0), entry.get('end')]]
+        sources.append({
+            'pdf': str(pdf),
+            'source': entry.get('source') or pdf.stem,
+            'ranges': [(start or 0, end) for start, end in ranges],
+        })
+    return sources
+
+
+class BatchParser:
+    """Parse several PDFs in one run and merge their creatures.
+
+    Every book's pages are planned up front and queued on one worker pool,
+    so extraction runs straight from one book into the next. Creatures found
+    in more than one book are kept from the source that comes first in
+    `precedence` (default: batch order); output follows batch order.
+    """
+
+    def __init__(self, sources: List[Dict[str, Any]], jobs: Optional[int] = None,
+                 cache: Optional[PageTextCache] = None, profile: Optional[ParseProfile] = None,
+                 block_budget: Optional[float] = None, prefilter: bool = True,
+                 precedence: Optional[List[str]] = None, validator: Optional[SchemaValidator] = None,
+                 block_types: Iterable[str] = ('creature',)):
+        self.sources = sources
+        self.jobs = jobs or default_jobs()
+        self.parsers = [
+            SF2eStatblockParser(s['pdf'], jobs=self.jobs, cache=cache, source=s['source'],
+                                profile=profile, block_budget=block_budget, prefilter=prefilter,
+                                validator=validator, block_types=block_types)
+            for s in sources
+        ]
+        labels = [s['source'] for s in sources]
+        unknown = [label for label in precedence or [] if label not in labels]
+        if unknown:
+            raise ValueError(f"Unknown sources in precedence: {', '.join(unknown)}")
+        # Sources missing from an explicit precedence rank after it, in batch order
+        self.precedence = list(precedence or []) + [l for l in labels if l not in (precedence or [])]
+        self.creatures: List[Dict[str, Any]] = []
+        self.records: Dict[str, List[Dict[str, Any]]] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def parse_pdf(self) -> List[Dict[str, Any]]:
+        """Parse every book and return the merged creature list."""
+        if self.jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                queue = ExtractionQueue(pool, self.jobs * SF2eStatblockParser.TASKS_IN_FLIGHT_PER_JOB)
+                for pdf_parser, source in zip(self.parsers, self.sources):
+                    pdf_parser.queue = queue
+                    for start, end in source['ranges']:
+                        pdf_parser.plan_extraction(start, end)
+                per_source = self._parse_sources()
+        else:
+            per_source = self._parse_sources()
+
+        self.creatures = self._merge(per_source)
+        for kind in self.parsers[0].records:
+            owner = self._owners([p.records[kind] for p in self.parsers])
+            self.records[kind] = [r for i, p in enumerate(self.parsers)
+                                  for r in p.records[kind] if owner[r['id']] == i]
+        return self.creatures
+
+    def iter_creatures(self) -> Iterator[Dict[str, Any]]:
+        """Yield the merged creatures; precedence needs every book parsed first."""
+        yield from self.parse_pdf()
+
+    def _parse_sources(self) -> List[List[Dict[str, Any]]]:
+        per_source = []
+        for pdf_parser, source in zip(self.parsers, self.sources):
+            creatures = []
+            seen_ids = set()
+            for start, end in source['ranges']:
+                for creature in pdf_parser.iter_creatures(start, end):
+                    # iter_creatures only dedups within one range
+                    if creature['id'] in seen_ids:
+                        pdf_parser.stats['duplicate'] = pdf_parser.stats.get('duplicate', 0) + 1
+                        pdf_parser.stats['parsed'] -= 1
+                        continue
+                    seen_ids.add(creature['id'])
+                    creatures.append(creature)
+            per_source.append(creatures)
+        return per_source
+
+    def _owners(self, per_source: List[List[Dict[str, Any]]]) -> Dict[str, int]:
+        """Index of the source each id is kept from, by precedence."""
+        ranked = sorted(range(len(self.sources)),
+                        key=lambda i: (self.precedence.index(self.sources[i]['source']), i))
+        owner: Dict[str, int] = {}
+        for i in ranked:
+            for record in per_source[i]:
+                owner.setdefault(record['id'], i)
+        return owner
+
+    def _merge(self, per_source: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Drop creatures another source with higher precedence also has."""
+        owner = self._owners(per_source)
+
+        merged = []
+        for i, (pdf_parser, creatures) in enumerate(zip(self.parsers, per_source)):
+            kept = [c for c in creatures if owner[c['id']] == i]
+            stats = {
+                'kept': len(kept),
+                'dropped_for_precedence': len(creatures) - len(kept),
+                'duplicates': pdf_parser.stats.get('duplicate', 0),
+                'failed': pdf_parser.stats.get('failed', 0),
+                'over_budget': pdf_parser.stats.get('over_budget', 0),
+            }
+            self.stats[f"{self.sources[i]['source']} ({Path(self.sources[i]['pdf']).name})"] = stats
+            merged.extend(kept)
+        return merged
+
+    def save_json(self, output_path: str):
+        """Save the merged creatures to one JSON file."""
+        output = write_json(self.creatures, output_path)
+        print(f"\nSaved {len(self.creatures)} creatures from {len(self.sources)} books to {output}")
+
+    def print_stats(self):
+        print("\nPer-source results:")
+        print(f"  {'source':<40} {'kept':>6} {'dropped':>8} {'dupes':>6} {'failed':>7} {'budget':>7}")
+        for label, stats in self.stats.items():
+            print(f"  {label:<40} {stats['kept']:>6} {stats['dropped_for_precedence']:>8} "
+                  f"{stats['duplicates']:>6} {stats['failed']:>7} {stats['over_budget']:>7}")
 
 
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='Parse Starfinder 2e statblocks from PDF')
-    parser.add_argument('pdf_path', help='Path to the Alien Core PDF')
+    parser.add_argument('pdf_path', nargs='?', help='Path to the Alien Core PDF')
+    parser.add_argument('--batch', metavar='FILE',
+                       help='Parse every book listed in a JSON batch file into one output '
+                            '(entries: {"pdf", "source", "ranges"})')
+    parser.add_argument('--precedence', nargs='+', metavar='SOURCE',
+                       help='With --batch, which source wins when books share a creature '
+                            '(default: batch order)')
     parser.add_argument('--output', '-o', default='../src/data/creatures.json',
                        help='Output JSON file path')
     parser.add_argument('--preview', '-p', type=int, nargs='+',
@@ -528,28 +2056,168 @@ def main():
                        help='Start page (0-indexed)')
     parser.add_argument('--end', type=int, default=None,
                        help='End page (0-indexed)')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'sharded'], default='json',
+                       help='json writes one array at the end; ndjson streams one creature per line; '
+                            'sharded writes a summary, stat block shards and a manifest into a '
+                            'directory named after --output (creatures.json -> creatures/)')
+    parser.add_argument('--shard-by', choices=['level', 'hash'], default='level',
+                       help='Group shards by level range or by id hash (default: %(default)s)')
+    parser.add_argument('--shard-size', type=int, default=3,
+                       help='Levels per shard, or target creatures per shard with --shard-by hash '
+                            '(default: %(default)s)')
+    parser.add_argument('--unshard', metavar='DIR',
+                       help='Rebuild a single-file --output from a sharded output directory and exit')
+    parser.add_argument('--merge', action='store_true',
+                       help='Update the existing output file in place, rewriting only added, changed or removed creatures')
+    parser.add_argument('--profile', nargs='?', const='pdf-parser-profile.json', default=None,
+                       metavar='REPORT',
+                       help='Time extraction per page and parse stages per block; '
+                            'writes a JSON report (default: %(const)s)')
+    parser.add_argument('--profile-top', type=int, default=10,
+                       help='Slowest blocks to list with --profile (default: %(default)s)')
+    parser.add_argument('--block-budget', type=float, default=None, metavar='SECONDS',
+                       help='Skip (and log) any statblock that takes longer than this to parse')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help=f'Worker processes for page extraction (default: CPU count, {default_jobs()})')
+    parser.add_argument('--schema', default=str(DEFAULT_SCHEMA_PATH),
+                       help='JSON schema creatures are checked against (default: %(default)s)')
+    parser.add_argument('--no-validate', action='store_true',
+                       help='Skip the schema check')
+    parser.add_argument('--strict', action='store_true',
+                       help='Leave creatures that fail the schema check out of the output')
+    parser.add_argument('--types', nargs='+', default=['creature'], choices=sorted(BLOCK_TYPES),
+                       help='Statblock types to parse in the same pass; each gets its own output '
+                            'file beside --output, e.g. hazards.json (default: %(default)s)')
+    parser.add_argument('--no-prefilter', action='store_true',
+                       help='Extract every page instead of only statblock header and continuation pages')
+
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always re-extract page text instead of using the on-disk cache')
+    parser.add_argument('--clear-cache', action='store_true',
+                       help='Delete all cached page text before running')
+    parser.add_argument('--cache-dir', default=None,
+                       help=f'Page text cache directory (default: {default_cache_dir()})')
+    parser.add_argument('--cache-size', type=int, default=PageTextCache.DEFAULT_MAX_MB,
+                       help='Page text cache size cap in MB (default: %(default)s)')
 
     args = parser.parse_args()
 
-    pdf_parser = SF2eStatblockParser(args.pdf_path)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.merge and args.format != 'json':
+        parser.error('--merge only supports --format json')
+    if args.shard_size < 1:
+        parser.error('--shard-size must be at least 1')
+    if args.batch and (args.pdf_path or args.preview or args.merge or args.start or args.end is not None):
+        parser.error('--batch takes its books and page ranges from the batch file '
+                     '(no pdf_path, --preview, --merge, --start or --end)')
+    if args.precedence and not args.batch:
+        parser.error('--precedence only applies to --batch')
+    if args.strict and args.no_validate:
+        parser.error('--strict needs the schema check (drop --no-validate)')
+
+    if args.unshard:
+        creatures = read_sharded(Path(args.unshard))
+        output = write_json(creatures, args.output)
+        print(f"\nSaved {len(creatures)} creatures to {output}")
+        return
+
+    cache = PageTextCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    if args.clear_cache:
+        cache.clear()
+        print(f"Cleared page text cache: {cache.cache_dir}")
+        if not args.pdf_path and not args.batch:
+            return
+    if not args.pdf_path and not args.batch:
+        parser.error('pdf_path is required')
+
+    profile = ParseProfile() if args.profile else None
+    validator = None
+    if not args.no_validate and 'creature' in args.types:
+        validator = SchemaValidator(Path(args.schema), strict=args.strict)
+    if args.batch:
+        try:
+            pdf_parser = BatchParser(load_batch(args.batch), jobs=args.jobs,
+                                     cache=None if args.no_cache else cache,
+                                     profile=profile, block_budget=args.block_budget,
+                                     prefilter=not args.no_prefilter, precedence=args.precedence,
+                                     validator=validator, block_types=args.types)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        page_range = ()
+    else:
+        pdf_parser = SF2eStatblockParser(args.pdf_path, jobs=args.jobs,
+                                         cache=None if args.no_cache else cache,
+                                         profile=profile, block_budget=args.block_budget,
+                                         prefilter=not args.no_prefilter, validator=validator,
+                                         block_types=args.types)
+        page_range = (args.start, args.end)
 
     if args.preview:
         print(pdf_parser.preview_pages(args.preview))
     else:
-        pdf_parser.parse_pdf(args.start, args.end)
-        pdf_parser.save_json(args.output)
+        levels = {}
+        if 'creature' not in args.types:
+            # Nothing streams; the other block types are collected below
+            pdf_parser.parse_pdf(*page_range)
+        elif args.format == 'ndjson':
+            def tally(creatures):
+                for c in creatures:
+                    levels[c['level']] = levels.get(c['level'], 0) + 1
+                    yield c
+
+            SF2eStatblockParser.write_ndjson(tally(pdf_parser.iter_creatures(*page_range)), args.output)
+        else:
+            pdf_parser.parse_pdf(*page_range)
+            if args.merge:
+                pdf_parser.merge_json(args.output, full_range=args.start == 0 and args.end is None)
+            elif args.format == 'sharded':
+                write_sharded(pdf_parser.creatures, sharded_output_dir(args.output),
+                              args.shard_by, args.shard_size)
+            else:
+                pdf_parser.save_json(args.output)
+            for c in pdf_parser.creatures:
+                levels[c['level']] = levels.get(c['level'], 0) + 1
+
+        if args.batch:
+            pdf_parser.print_stats()
+        if validator:
+            validator.print_report()
+
+        for kind, records in pdf_parser.records.items():
+            block_type = BLOCK_TYPES[kind]
+            if not args.no_validate and block_type.schema:
+                record_validator = SchemaValidator(SCHEMAS_DIR / block_type.schema, strict=args.strict)
+                records = list(record_validator.run(records))
+                record_validator.print_report()
+            records_path = block_output_path(args.output, block_type)
+            if args.format == 'ndjson':
+                SF2eStatblockParser.write_ndjson(records, str(records_path))
+            else:
+                records_path.parent.mkdir(parents=True, exist_ok=True)
+                records_path.write_text(json.dumps(records, indent=2))
+                print(f"\nSaved {len(records)} {block_type.plural} to {records_path}")
 
         # Print summary
         print("\n" + "="*60)
         print("PARSING COMPLETE")
         print("="*60)
-        levels = {}
-        for c in pdf_parser.creatures:
-            levels[c['level']] = levels.get(c['level'], 0) + 1
         print("\nCreatures by level:")
         for level in sorted(levels.keys()):
             print(f"  Level {level}: {levels[level]} creatures")
 
+        if profile:
+            report = profile.report(args.profile_top)
+            Path(args.profile).write_text(json.dumps(report, indent=2))
+            print(f"\nSlowest blocks (wall {report['wall_seconds']:.2f}s, "
+                  f"waiting on pages {report['extraction']['wait_seconds']:.2f}s, "
+                  f"parsing {report['parsing']['seconds']:.2f}s):")
+            for block in report['slowest_blocks']:
+                slowest_stage = max(block['stages'], key=block['stages'].get, default='-')
+                print(f"  {block['seconds'] * 1000:8.1f} ms  {block['name']} (page {block['page']}, "
+                      f"{block['status']}, slowest stage: {slowest_stage})")
+            print(f"Profile written to {args.profile}")
+
 
 if __name__ == '__main__':
     main()
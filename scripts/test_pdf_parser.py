@@ -0,0 +1,243 @@
+"""
+Tests for the SF2e statblock parser
+
+Run from the scripts directory:
+    python3 -m pytest -q test_pdf_parser.py
+"""
+
+from pdf_parser import BLOCK_TYPES, SF2eStatblockParser, scan_statblock_pages
+
+HAZARD_PAGE = """SPIKE PLATE HAZARD 2
+MECHANICAL TRAP
+Stealth DC 18 (trained)
+Description Hidden spikes jut from a pressure plate in the floor.
+Disable DC 18 Thievery to jam the plate
+AC 18; Fort +10, Ref +4
+Hardness 8, HP 32 (BT 16)
+Spike Burst [reaction] Trigger A creature steps on the plate; Effect Spikes deal 2d6 piercing damage.
+"""
+
+CREATURE_PAGE = """GHOUL MARINE CREATURE 4
+MEDIUM UNDEAD GHOUL
+Perception +10; darkvision
+Languages Common
+Skills Athletics +12, Stealth +10
+Str +4, Dex +3, Con +2, Int +0, Wis +2, Cha -1
+AC 21; Fort +12, Ref +11, Will +9
+HP 60; Immunities disease, poison
+Speed 25 feet
+Melee [one-action] claw +14 (agile), Damage 1d6+6 slashing
+Paralysis [reaction] Trigger A creature hits the ghoul marine; Effect The creature is paralyzed for 1 round.
+"""
+
+
+def parse_blocks(types, pages):
+    parser = SF2eStatblockParser('synthetic.pdf', block_types=types)
+    return parser, list(parser.iter_blocks(enumerate(pages)))
+
+
+def test_hazard_ends_at_creature_header_when_only_hazards_enabled():
+    parser, blocks = parse_blocks(['hazard'], [HAZARD_PAGE, CREATURE_PAGE])
+    assert [b['type'] for b in blocks] == ['hazard']
+    assert 'GHOUL' not in blocks[0]['text']
+
+    hazard = BLOCK_TYPES['hazard'].parse(parser, blocks[0], None)
+    assert 'attackBonus' not in hazard
+    assert 'damage' not in hazard
+    assert [a['name'] for a in hazard['actions']] == ['Spike Burst']
+
+    both, both_blocks = parse_blocks(['creature', 'hazard'], [HAZARD_PAGE, CREATURE_PAGE])
+    assert hazard == BLOCK_TYPES['hazard'].parse(both, both_blocks[0], None)
+
+
+def test_creature_ends_at_hazard_header_when_only_creatures_enabled():
+    _, blocks = parse_blocks(['creature'], [CREATURE_PAGE, HAZARD_PAGE])
+    assert [b['type'] for b in blocks] == ['creature']
+    assert 'SPIKE' not in blocks[0]['text']
+
+
+def test_clear_cache_with_batch_still_parses(tmp_path, monkeypatch):
+    import pdf_parser
+
+    parsed = []
+
+    class FakeBatch:
+        def __init__(self, sources, **kwargs):
+            self.creatures = []
+            self.records = {}
+
+        def parse_pdf(self):
+            parsed.append(True)
+
+        def save_json(self, output_path):
+            pass
+
+        def print_stats(self):
+            pass
+
+    monkeypatch.setattr(pdf_parser, 'load_batch', lambda path: [])
+    monkeypatch.setattr(pdf_parser, 'BatchParser', FakeBatch)
+    monkeypatch.setattr('sys.argv', [
+        'pdf_parser.py', '--batch', 'books.json', '--clear-cache',
+        '--cache-dir', str(tmp_path / 'cache'), '--output', str(tmp_path / 'creatures.json'),
+        '--no-validate',
+    ])
+    pdf_parser.main()
+    assert parsed == [True]
+
+
+def write_text_pdf(path, pages):
+    """A minimal PDF with one Helvetica line per text line, enough for pdfplumber and pdfium."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        escaped = text.replace('(', r'\(').replace(')', r'\)')
+        lines = ''.join(f"({line}) Tj 0 -12 Td " for line in escaped.splitlines())
+        stream = f"BT /F1 9 Tf 36 756 Td {lines}ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(out)
+
+
+LORE_PAGE = """the ghoul marines were once ordinary soldiers,
+who fell to the hunger aboard a derelict cruiser.
+they now drift between the stars in search of prey.
+"""
+
+
+def test_prefilter_keeps_continuation_pages_mid_book(tmp_path):
+    # Lore pages around two statblocks; the ghoul marine's attacks and
+    # reaction spill over two pages and the tunnel worm's over one
+    head, tail = CREATURE_PAGE.split('Speed 25 feet\n')
+    melee, reaction = tail.split('Paralysis')
+    worm = 'TUNNEL WORM CREATURE 2\n' + CREATURE_PAGE.split('\n', 1)[1]
+    worm_head, worm_tail = worm.split('Speed 25 feet\n')
+    pages = ['Introduction\n' + LORE_PAGE,
+             'Aliens\n' + head + 'Speed 25 feet\n',
+             melee,
+             'Paralysis' + reaction,
+             LORE_PAGE,
+             LORE_PAGE,
+             'Tunnel Worms\n' + worm_head + 'Speed 25 feet\n',
+             worm_tail,
+             LORE_PAGE]
+    pdf = tmp_path / 'book.pdf'
+    write_text_pdf(pdf, pages)
+
+    assert scan_statblock_pages(str(pdf), 0, len(pages)) == [1, 2, 3, 6, 7]
+
+    # Nothing from the statblocks is lost, and the lore after them no longer
+    # runs on into the last ability's description
+    statblocks_only = tmp_path / 'statblocks.pdf'
+    write_text_pdf(statblocks_only, [pages[i] for i in (1, 2, 3, 6, 7)])
+    filtered = SF2eStatblockParser(str(pdf), jobs=1, prefilter=True).parse_pdf()
+    unfiltered = SF2eStatblockParser(str(statblocks_only), jobs=1, prefilter=False).parse_pdf()
+    assert [c['name'] for c in filtered] == ['Ghoul Marine', 'Tunnel Worm']
+    assert filtered == unfiltered
+    for creature in filtered:
+        assert creature['attacks']
+        assert 'Paralysis' in [a['name'] for a in creature['specialAbilities']]
+
+
+def test_prefilter_uses_every_registered_keyword(tmp_path):
+    # A hazard header ends the creature's continuation pages even when only
+    # creatures are parsed, as it does for the header pattern
+    pages = ['Aliens\n' + CREATURE_PAGE, 'Traps\n' + HAZARD_PAGE, LORE_PAGE]
+    pdf = tmp_path / 'book.pdf'
+    write_text_pdf(pdf, pages)
+
+    parser = SF2eStatblockParser(str(pdf), jobs=1, block_types=['creature'])
+    wanted, _ = parser.plan_extraction()
+    assert wanted == [0, 1]
+    assert wanted == scan_statblock_pages(str(pdf), 0, len(pages), ['CREATURE', 'HAZARD'])
+
+
+def test_hazard_actions_carry_damage_dice():
+    parser, blocks = parse_blocks(['hazard'], [HAZARD_PAGE])
+    action = BLOCK_TYPES['hazard'].parse(parser, blocks[0], None)['actions'][0]
+    assert action['damage'] == '2d6 piercing'
+    assert action['damageDice'] == [{'numDice': 2, 'dieSize': 6, 'modifier': 0, 'damageType': 'piercing'}]
+
+
+def test_whole_average_damage_is_an_int():
+    import json
+    from pdf_parser import average_damage, parse_damage_dice
+
+    assert json.dumps(average_damage(parse_damage_dice('1d6+6 slashing'))) == '9.5'
+    assert json.dumps(average_damage(parse_damage_dice('2d6+4 fire'))) == '11'
+    assert json.dumps(average_damage([])) == '0'
+
+
+def test_unshard_writes_json_without_a_parser(tmp_path, monkeypatch):
+    import json
+    import pdf_parser
+
+    creatures = [{'id': f"c{i}", 'name': f"C{i}", 'level': i, 'traits': [], 'size': 'medium',
+                  'source': 'Test'} for i in range(-1, 7)]
+    pdf_parser.write_sharded(creatures, tmp_path / 'creatures')
+
+    def no_parser(*args, **kwargs):
+        raise AssertionError('--unshard should not need a PDF parser')
+
+    monkeypatch.setattr(pdf_parser, 'SF2eStatblockParser', no_parser)
+    output = tmp_path / 'out' / 'creatures.json'
+    monkeypatch.setattr('sys.argv', ['pdf_parser.py', '--unshard', str(tmp_path / 'creatures'),
+                                     '--output', str(output)])
+    pdf_parser.main()
+    assert json.loads(output.read_text()) == creatures
+
+
+def test_batch_parses_the_same_range_listed_twice(tmp_path):
+    from pdf_parser import BatchParser, PageTextCache
+
+    # With a cache, planning the range again after reading it finds nothing
+    # to extract, so a plan lost to the repeat leaves its pages queued
+    # ahead of the next book's
+    pdf = tmp_path / 'book.pdf'
+    write_text_pdf(pdf, ['Aliens\n' + CREATURE_PAGE, LORE_PAGE])
+    other = tmp_path / 'other.pdf'
+    write_text_pdf(other, ['Traps\n' + HAZARD_PAGE, LORE_PAGE])
+    sources = [
+        {'pdf': str(pdf), 'source': 'Book', 'ranges': [(0, None), (0, None)]},
+        {'pdf': str(other), 'source': 'Other', 'ranges': [(0, None)]},
+        {'pdf': str(pdf), 'source': 'Again', 'ranges': [(0, None)]},
+    ]
+    batch = BatchParser(sources, jobs=2, cache=PageTextCache(tmp_path / 'cache'),
+                        block_types=['creature', 'hazard'])
+    assert [c['name'] for c in batch.parse_pdf()] == ['Ghoul Marine']
+    assert [h['name'] for h in batch.records['hazard']] == ['Spike Plate']
+    assert batch.stats['Book (book.pdf)']['duplicates'] == 1
+    assert batch.stats['Again (book.pdf)']['dropped_for_precedence'] == 1
+
+
+def test_schema_validator_reports_and_drops_invalid_creatures():
+    from pdf_parser import SchemaValidator
+
+    parser, blocks = parse_blocks(['creature'], [CREATURE_PAGE])
+    creature = BLOCK_TYPES['creature'].parse(parser, blocks[0], None)
+    broken = dict(creature, id='broken', level='four')
+    creatures = [creature, broken] * (SchemaValidator.BATCH_SIZE + 1)
+
+    lenient = SchemaValidator()
+    assert list(lenient.run(creatures)) == creatures
+    assert lenient.checked == len(creatures)
+    assert {(v['id'], v['path']) for v in lenient.violations} == {('broken', '$.level')}
+    assert len(lenient.violations) == SchemaValidator.BATCH_SIZE + 1
+
+    strict = SchemaValidator(strict=True)
+    assert list(strict.run(creatures)) == [creature] * (SchemaValidator.BATCH_SIZE + 1)
+    assert strict.excluded == SchemaValidator.BATCH_SIZE + 1
@@ -0,0 +1,273 @@
+"""
+Tests for the video-to-ASCII converter
+
+Clips are synthetic raw gray frames fed through --raw, so neither ffmpeg
+nor a video file is needed. Run from the scripts directory:
+    python3 -m pytest -q test_video_to_ascii.py
+"""
+
+import hashlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# The converter's file name has hyphens, so it is loaded by path
+_spec = importlib.util.spec_from_file_location(
+    'video_to_ascii', Path(__file__).with_name('video-to-ascii.py'))
+video_to_ascii = importlib.util.module_from_spec(_spec)
+sys.modules['video_to_ascii'] = video_to_ascii
+_spec.loader.exec_module(video_to_ascii)
+
+FPS = 12
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    # Keep the conversion cache index out of the real home directory
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+
+def synthetic_clip(cols, rows, frames, seed=1):
+    """
+    A noise backdrop with a block moving across it, held still for a few
+    frames, so deltas have small patches and dedup has repeats to merge.
+    """
+    rng = np.random.default_rng(seed)
+    clip = np.repeat(rng.integers(0, 256, (1, rows, cols), dtype=np.uint8), frames, axis=0)
+    size = max(1, min(rows, cols) // 4)
+    for i in range(frames):
+        step = 2 if 3 <= i <= 5 else i
+        top = step % (rows - size + 1)
+        left = 3 * step % (cols - size + 1)
+        clip[i, top:top + size, left:left + size] = 255 - clip[i, top:top + size, left:left + size]
+    return clip
+
+
+def run(monkeypatch, *argv):
+    monkeypatch.setattr('sys.argv', ['video-to-ascii.py', *map(str, argv)])
+    video_to_ascii.main()
+
+
+def apply_patch(frame, patch):
+    """Paste a delta entry's [row, col, text, ...] runs over the previous frame."""
+    lines = frame.split('\n')
+    for row, col, text in zip(patch[0::3], patch[1::3], patch[2::3]):
+        lines[row] = lines[row][:col] + text + lines[row][col + len(text):]
+    return '\n'.join(lines)
+
+
+def decode_entries(entries):
+    """Frame strings from plain or delta format entries."""
+    frames = []
+    for entry in entries:
+        frames.append(entry if isinstance(entry, str) else apply_patch(frames[-1], entry))
+    return frames
+
+
+def expand(frames, durations):
+    """One frame per tick at the clip's fps, repeating merged frames for their duration."""
+    if durations is None:
+        return frames
+    assert len(durations) == len(frames)
+    return [frame for frame, duration in zip(frames, durations) for _ in range(duration)]
+
+
+def read_clip(path):
+    """(header, one frame string per tick) from a JSON, segmented or binary output."""
+    path = Path(path)
+    if path.suffix == '.bin':
+        return video_to_ascii.read_binary(path)
+    data = json.loads(path.read_text())
+    if 'segments' not in data:
+        assert len(data['frames']) == data['frameCount']
+        return data, expand(decode_entries(data['frames']), data.get('durations'))
+
+    ticks = []
+    for segment in data['segments']:
+        content = (path.parent / segment['url']).read_bytes()
+        assert hashlib.sha256(content).hexdigest() == segment['hash']
+        body = json.loads(content)
+        # Every segment opens on a keyframe, so it decodes on its own
+        assert isinstance(body['frames'][0], str)
+        frames = expand(decode_entries(body['frames']), body.get('durations'))
+        assert len(frames) == segment['duration']
+        ticks += frames
+    return data, ticks
+
+
+def output_files(directory):
+    """Every file under directory, relative path -> bytes."""
+    return {str(p.relative_to(directory)): p.read_bytes()
+            for p in sorted(Path(directory).rglob('*')) if p.is_file()}
+
+
+def reference_frames(clip):
+    """Frame strings converted directly, one character per raw cell."""
+    _, rows, cols = clip.shape
+    return video_to_ascii.frames_to_ascii(clip.tobytes(), cols, rows)
+
+
+def test_raw_input_at_the_target_width_is_not_downscaled(tmp_path, monkeypatch):
+    clip = synthetic_clip(160, 44, 12)
+    raw = tmp_path / 'clip.raw'
+    raw.write_bytes(clip.tobytes())
+    output = tmp_path / 'out.json'
+
+    run(monkeypatch, raw, output, 160, FPS, '--raw', '160x44', '--no-cache')
+    data = json.loads(output.read_text())
+    assert (data['cols'], data['rows']) == (160, 44)
+    assert data['frames'] == reference_frames(clip)
+
+
+def test_narrower_renditions_of_a_raw_grid_keep_its_shape(tmp_path, monkeypatch):
+    clip = synthetic_clip(160, 44, 12)
+    raw = tmp_path / 'clip.raw'
+    raw.write_bytes(clip.tobytes())
+    output = tmp_path / 'out.json'
+
+    run(monkeypatch, raw, output, '--raw', '160x44', '--renditions', '80,160', '--no-cache')
+    manifest = json.loads(output.read_text())
+    assert [(r['cols'], r['rows']) for r in manifest['renditions']] == [(80, 22), (160, 44)]
+    half = json.loads((tmp_path / 'out.80.json').read_text())
+    scaled = video_to_ascii.Downscaler(160, 44, 80, 22)(clip.tobytes())
+    assert half['frames'] == video_to_ascii.frames_to_ascii(bytes(scaled), 80, 22)
+
+
+def test_raw_pixels_wider_than_the_target_are_downscaled_like_a_video(tmp_path, monkeypatch):
+    # 320x176 pixels at 160 columns: half the width, and a quarter of the
+    # height since cells are two pixels high
+    clip = synthetic_clip(320, 176, 12)
+    raw = tmp_path / 'clip.raw'
+    raw.write_bytes(clip.tobytes())
+    output = tmp_path / 'out.json'
+
+    run(monkeypatch, raw, output, 160, FPS, '--raw', '320x176', '--no-cache')
+    data = json.loads(output.read_text())
+    assert (data['cols'], data['rows']) == (160, 44)
+    scaled = video_to_ascii.Downscaler(320, 176, 160, 44)(clip.tobytes())
+    assert data['frames'] == video_to_ascii.frames_to_ascii(bytes(scaled), 160, 44)
+
+
+def test_frame_change_ratio_is_measured_per_rendition_on_characters(tmp_path, monkeypatch):
+    # A checkerboard that inverts every frame changes every source pixel, but
+    # each cell averages it out to the same gray, so no character changes
+    board = np.indices((176, 320)).sum(axis=0) % 2 * 255
+    clip = np.stack([board, 255 - board] * 6).astype(np.uint8)
+    raw = tmp_path / 'clip.raw'
+    raw.write_bytes(clip.tobytes())
+    report = tmp_path / 'metrics.json'
+
+    run(monkeypatch, raw, tmp_path / 'out.json', '--raw', '320x176', '--renditions', '80,160',
+        '--metrics', report, '--no-cache')
+    metrics = json.loads(report.read_text())
+    assert metrics['frames'] == 12
+    assert metrics['frame_change_ratio'] == {'80': 0.0, '160': 0.0}
+
+
+# 100 frames at 40x12 span two read chunks
+CLIP = synthetic_clip(40, 12, 100)
+ROUND_TRIPS = [
+    ('frames', []),
+    ('delta', []),
+    ('delta', ['--keyframe-interval', 5]),
+    ('binary', []),
+    ('frames', ['--dedup']),
+    ('delta', ['--dedup']),
+    ('frames', ['--segment-seconds', 1]),
+    ('delta', ['--segment-seconds', 1, '--dedup']),
+]
+
+
+def write_clip(tmp_path, clip=CLIP):
+    raw = tmp_path / 'clip.raw'
+    raw.write_bytes(clip.tobytes())
+    return raw
+
+
+def convert_clip(monkeypatch, raw, out_dir, fmt, options, cols=40, raw_size='40x12'):
+    output = Path(out_dir) / f"out{video_to_ascii.RENDITION_SUFFIX[fmt]}"
+    run(monkeypatch, raw, output, cols, FPS, '--raw', raw_size, '--format', fmt, *options)
+    return output
+
+
+@pytest.mark.parametrize('fmt,options', ROUND_TRIPS)
+def test_every_writer_round_trips_to_the_reference_frames(tmp_path, monkeypatch, fmt, options):
+    output = convert_clip(monkeypatch, write_clip(tmp_path), tmp_path, fmt, [*options, '--no-cache'])
+    header, frames = read_clip(output)
+    assert (header['cols'], header['rows'], header['fps']) == (40, 12, FPS)
+    assert frames == reference_frames(CLIP)
+
+
+def test_dedup_merges_held_frames_into_durations(tmp_path, monkeypatch):
+    output = convert_clip(monkeypatch, write_clip(tmp_path), tmp_path, 'frames', ['--dedup', '--no-cache'])
+    data = json.loads(output.read_text())
+    # Frames 3-5 repeat frame 2
+    assert data['durations'][:4] == [1, 1, 4, 1]
+    assert data['frameCount'] == 97
+    assert sum(data['durations']) == 100
+
+
+def test_segments_cover_about_the_requested_seconds(tmp_path, monkeypatch):
+    output = convert_clip(monkeypatch, write_clip(tmp_path), tmp_path, 'delta',
+                          ['--segment-seconds', 1, '--no-cache'])
+    manifest = json.loads(output.read_text())
+    assert manifest['segmentFrames'] == FPS
+    assert [s['duration'] for s in manifest['segments']] == [12] * 8 + [4]
+
+
+@pytest.mark.parametrize('fmt', ['frames', 'delta', 'binary'])
+def test_renditions_round_trip_to_downscaled_frames(tmp_path, monkeypatch, fmt):
+    output = convert_clip(monkeypatch, write_clip(tmp_path), tmp_path, fmt,
+                          ['--renditions', '20,40', '--no-cache'])
+    manifest = json.loads(output.read_text())
+    assert [(r['cols'], r['rows']) for r in manifest['renditions']] == [(20, 6), (40, 12)]
+
+    narrow = bytes(video_to_ascii.Downscaler(40, 12, 20, 6)(CLIP.tobytes()))
+    expected = {20: video_to_ascii.frames_to_ascii(narrow, 20, 6), 40: reference_frames(CLIP)}
+    for rendition in manifest['renditions']:
+        path = output.parent / rendition['url']
+        assert path.stat().st_size == rendition['bytes']
+        _, frames = read_clip(path)
+        assert frames == expected[rendition['cols']]
+
+
+@pytest.mark.parametrize('fmt,options', ROUND_TRIPS + [('binary', ['--renditions', '20,40'])])
+def test_jobs_write_the_same_bytes(tmp_path, monkeypatch, fmt, options):
+    raw = write_clip(tmp_path)
+    outputs = {}
+    for jobs in (1, 3):
+        out_dir = tmp_path / f"j{jobs}"
+        out_dir.mkdir()
+        convert_clip(monkeypatch, raw, out_dir, fmt, [*options, '-j', jobs, '--no-cache'])
+        outputs[jobs] = output_files(out_dir)
+    assert outputs[1] == outputs[3]
+
+
+def test_cache_skips_unchanged_outputs_and_rebuilds_changed_ones(tmp_path, monkeypatch, capsys):
+    raw = write_clip(tmp_path)
+    out_dir = tmp_path / 'out'
+    out_dir.mkdir()
+    options = ['--segment-seconds', 1]
+    output = convert_clip(monkeypatch, raw, out_dir, 'delta', options)
+    built = output_files(out_dir)
+    capsys.readouterr()
+
+    convert_clip(monkeypatch, raw, out_dir, 'delta', options)
+    assert 'is up to date' in capsys.readouterr().out
+
+    # A segment edited since makes the output stale
+    segment = sorted((out_dir / video_to_ascii.SEGMENTS_DIR).iterdir())[0]
+    segment.write_text('{}')
+    convert_clip(monkeypatch, raw, out_dir, 'delta', options)
+    assert 'is up to date' not in capsys.readouterr().out
+    assert output_files(out_dir) == built
+
+    # So does any option that changes the output
+    convert_clip(monkeypatch, raw, out_dir, 'delta', [*options, '--keyframe-interval', 5])
+    assert 'is up to date' not in capsys.readouterr().out
+    _, frames = read_clip(output)
+    assert frames == reference_frames(CLIP)
@@ -4,108 +4,1283 @@ Convert video to ASCII frames JSON for web playback
 Much faster than bash version - uses numpy for pixel processing
 """
 
+import argparse
+import glob
+import gzip
+import hashlib
+import mmap
 import subprocess
 import json
-import sys
-import tempfile
+import struct
 import os
+import sys
+import time
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 # Rich ASCII character set from dark to light
 ASCII_CHARS = ' .·:+*oø®œ#@'
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python video-to-ascii.py <input.mp4> [output.json] [cols] [fps]")
-        sys.exit(1)
+# Frames converted per vectorized batch; small enough to stay cache-resident
+CHUNK_FRAMES = 64
+
+# With --jobs, chunks queued per worker so none idles while results are collected
+CHUNKS_IN_FLIGHT_PER_JOB = 2
+
+# Delta format: frames between keyframes, and the unchanged-cell gap that
+# still joins two changed runs
+DELTA_FORMAT_VERSION = 2
+KEYFRAME_INTERVAL = 48
+RUN_GAP = 6
+
+# Segmented output: segment files live here, beside the manifest
+SEGMENTS_DIR = 'ascii-segments'
+
+DEFAULT_OUTPUT = Path('public/ascii-frames.json')
+
+# Batch mode converts files with these extensions found in input directories
+VIDEO_EXTENSIONS = {'.mp4', '.m4v', '.mov', '.webm', '.mkv', '.avi', '.gif'}
+
+# With --renditions, file suffix of each rendition beside the manifest
+RENDITION_SUFFIX = {'frames': '.json', 'delta': '.json', 'binary': '.bin'}
+
+# Binary container: magic, version, palette bytes, fps, cols, rows,
+# frame count, frame table offset
+BINARY_MAGIC = b'ASCF'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sBBHHHII')
+
+# Output format versions, part of every conversion cache key
+FORMAT_VERSIONS = {'frames': 1, 'delta': DELTA_FORMAT_VERSION, 'binary': BINARY_VERSION}
+
+
+def build_index_lut(chars=ASCII_CHARS):
+    """Map every gray level to its character's index in the palette."""
+    num_chars = len(chars)
+    return np.array([min(gray * num_chars // 256, num_chars - 1) for gray in range(256)],
+                    dtype=np.uint8)
+
+
+def build_lut(chars=ASCII_CHARS):
+    """Map every gray level to the UTF-16 code unit of its character."""
+    if any(ord(c) > 0xFFFF for c in chars):
+        raise ValueError("ASCII_CHARS must be in the Basic Multilingual Plane")
+    return np.array([ord(c) for c in chars], dtype='<u2').take(build_index_lut(chars))
+
+
+INDEX_LUT = build_index_lut()
+LUT = build_lut()
+NEWLINE = ord('\n')
+
+
+def map_frames(raw_data, cols, rows, lut=LUT):
+    """
+    Map whole rawvideo gray frames to a (frames, rows, cols + 1) code array.
+
+    The buffer is viewed as a (frames, rows, cols) array and mapped through
+    the lookup table in one step; each row gets a trailing newline column
+    so a frame is a single contiguous UTF-16 run that decodes in bulk.
+    Trailing bytes that don't fill a frame are ignored.
+    """
+    frame_size = cols * rows
+    count = len(raw_data) // frame_size
+
+    pixels = np.frombuffer(raw_data, dtype=np.uint8, count=count * frame_size)
+    codes = np.empty((count, rows, cols + 1), dtype='<u2')
+    codes[:, :, :cols] = lut.take(pixels.reshape(count, rows, cols))
+    codes[:, :, cols] = NEWLINE
+    return codes
+
+
+def codes_to_text(codes):
+    """Decode a map_frames() array into one string per frame."""
+    count, rows, width = codes.shape
+    if not count:
+        return []
+    text = codes.tobytes().decode('utf-16-le')
+    stride = rows * width
+    # Drop each frame's final newline to match '\n'.join(lines)
+    return [text[i:i + stride - 1] for i in range(0, count * stride, stride)]
+
+
+def frames_to_ascii(raw_data, cols, rows, lut=LUT):
+    """Convert whole rawvideo gray frames to ASCII strings."""
+    return codes_to_text(map_frames(raw_data, cols, rows, lut))
+
+
+def pack_frames(raw_data, cols, rows, index_lut=INDEX_LUT):
+    """Palette indices of whole raw gray frames, two cells per byte."""
+    cells = cols * rows
+    count = len(raw_data) // cells
+    pixels = np.frombuffer(raw_data, dtype=np.uint8, count=count * cells)
+    indices = index_lut.take(pixels.reshape(count, cells))
+    if cells % 2:
+        indices = np.pad(indices, ((0, 0), (0, 1)))
+    return (indices[:, 0::2] << 4) | indices[:, 1::2]
+
+
+def json_string(text):
+    """A string exactly as json.dump writes it, quotes included."""
+    return json.encoder.encode_basestring_ascii(text)
+
+
+def encode_frames(chunk, previous, start, keyframes, cols, rows):
+    """Plain format: each frame's full string, JSON-encoded."""
+    return [json_string(text) for text in frames_to_ascii(chunk, cols, rows)]
+
+
+def encode_delta(chunk, previous, start, keyframes, cols, rows, keyframe_interval, gap):
+    """
+    Delta format entries for one chunk, JSON-encoded.
+
+    `previous` is the raw frame before the chunk (None at the start of the
+    clip) and `start` the chunk's first frame index, so any chunk can be
+    encoded on its own. Frame indices in `keyframes` are always sent whole,
+    so segments can start on them. Returns (entries, keyframe count,
+    plain-format bytes).
+    """
+    codes = map_frames(chunk, cols, rows)
+    texts = codes_to_text(codes)
+    last = map_frames(previous, cols, rows)[0] if previous is not None else None
+    entries = []
+    keyframe_count = 0
+    full_size = 0
+    for index, (frame, text) in enumerate(zip(codes, texts), start):
+        full = json_string(text)
+        full_size += len(full) + 2
+        patch = None
+        if last is not None and index % keyframe_interval and index not in keyframes:
+            patch = delta_patch(last, frame, text, cols, gap, len(full))
+        if patch is None:
+            keyframe_count += 1
+            entries.append(full)
+        else:
+            entries.append(json.dumps(patch))
+        last = frame
+    return entries, keyframe_count, full_size
+
+
+def delta_patch(previous, frame, text, cols, gap, limit):
+    """Runs turning `previous` into `frame`, or None once they cost `limit` bytes."""
+    changed = frame[:, :cols] != previous[:, :cols]
+    patch = []
+    cost = 0
+    for row in np.flatnonzero(changed.any(axis=1)).tolist():
+        cells = np.flatnonzero(changed[row])
+        breaks = np.flatnonzero(np.diff(cells) > gap)
+        starts = cells[np.r_[0, breaks + 1]].tolist()
+        ends = (cells[np.r_[breaks, len(cells) - 1]] + 1).tolist()
+        base = row * (cols + 1)
+        for start, end in zip(starts, ends):
+            run = text[base + start:base + end]
+            patch += [row, start, run]
+            cost += len(json_string(run)) + len(str(row)) + len(str(start)) + 3
+        if cost >= limit:
+            return None
+    return patch
+
+
+def encode_binary(chunk, previous, start, keyframes, cols, rows, index_lut):
+    """Binary format: packed palette indices."""
+    return pack_frames(chunk, cols, rows, index_lut)
+
+
+class FrameDeduper:
+    """
+    Merge runs of repeated frames into one entry with a duration.
+
+    Frames are compared as palette indices, i.e. as converted characters,
+    against the last frame kept. A frame whose differing cells are within
+    `tolerance` (a fraction of all cells; 0 means identical) is dropped
+    and the kept entry's duration, in frames at the clip's fps, grows by
+    one, so total playback time is unchanged.
+    """
+
+    def __init__(self, cols, rows, tolerance=0.0, chars=ASCII_CHARS):
+        self.limit = int(tolerance * cols * rows)
+        self.index_lut = build_index_lut(chars)
+        # JSON bytes per cell by palette index, for the savings estimate
+        self.cell_bytes = np.array([len(json_string(c)) - 2 for c in chars])
+        self.frame_overhead = 2 * (rows - 1) + 4
+        self.durations = []
+        self.last = None
+        self.dropped = 0
+        self.dropped_bytes = 0
+
+    def compact(self, chunk, frame_size):
+        """Drop repeats from a writable chunk in place; returns the bytes kept."""
+        count = len(chunk) // frame_size
+        frames = np.frombuffer(chunk, dtype=np.uint8, count=count * frame_size).reshape(count, frame_size)
+        indices = self.index_lut.take(frames)
+        keep = []
+        for i, frame in enumerate(indices):
+            if self.last is not None and np.count_nonzero(frame != self.last) <= self.limit:
+                self.durations[-1] += 1
+                self.dropped += 1
+                self.dropped_bytes += int(self.cell_bytes.take(frame).sum()) + self.frame_overhead
+                continue
+            keep.append(i)
+            self.durations.append(1)
+            self.last = frame
+        if len(keep) < count:
+            frames[:len(keep)] = frames[keep]
+        return len(keep) * frame_size
+
+    def summary(self):
+        total = len(self.durations) + self.dropped
+        return (f"Dedup: merged {self.dropped} of {total} frames into longer durations, "
+                f"~{self.dropped_bytes / 1024:.1f} KB of frame data saved")
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'public/ascii-frames.json'
-    cols = int(sys.argv[3]) if len(sys.argv) > 3 else 160
-    fps = int(sys.argv[4]) if len(sys.argv) > 4 else 12
 
-    print(f"Converting {input_file} to ASCII...")
-    print(f"Settings: {cols} columns, {fps} fps")
+class Segmenter:
+    """
+    Choose where segments start, as frames arrive in order.
 
-    # Get video dimensions
-    probe = subprocess.run([
-        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
-        '-show_entries', 'stream=width,height',
-        '-of', 'csv=p=0', input_file
-    ], capture_output=True, text=True)
+    A segment closes once it covers `length` frames of playback (with
+    durations, merged frames count for their full duration); the next
+    entry then opens a new one.
+    """
 
-    orig_width, orig_height = map(int, probe.stdout.strip().split(','))
-    rows = int(orig_height * cols / orig_width / 2)  # /2 for terminal aspect ratio
-    if rows < 1:
-        rows = 1
+    def __init__(self, length):
+        self.length = length
+        self.starts = []
+        self.entries = 0
+        self.ticks = 0
 
-    print(f"Frame dimensions: {cols}x{rows}")
+    def place(self, count, durations=None):
+        """Segment starts among the next `count` entries; durations must cover earlier ones."""
+        opened = []
+        for entry in range(self.entries, self.entries + count):
+            if entry:
+                self.ticks += durations[entry - 1] if durations else 1
+            if not entry or self.ticks >= self.length:
+                opened.append(entry)
+                self.ticks = 0
+        self.starts += opened
+        self.entries += count
+        return opened
 
-    # Extract frames as raw grayscale
-    with tempfile.NamedTemporaryFile(suffix='.raw', delete=False) as tmp:
-        raw_file = tmp.name
 
+class FramesWriter:
+    """
+    Version 1 JSON: every frame as one full string.
+
+    Writers collect chunks encoded by encoder(), a picklable function of
+    (chunk, previous frame, first frame index, keyframe indices), so chunks can be encoded
+    in any order on worker processes and collected in order here. Frames
+    are kept as their JSON text, so the encoding also happens on the
+    workers and write() only concatenates.
+    """
+
+    def __init__(self, fps, cols, rows):
+        self.fps = fps
+        self.cols = cols
+        self.rows = rows
+        self.frames = []
+        self.frame_count = 0
+        # FrameDeduper, when repeated frames become durations
+        self.dedup = None
+        # Segmenter, when the clip is split into segment files
+        self.segmenter = None
+
+    def encoder(self):
+        return partial(encode_frames, cols=self.cols, rows=self.rows)
+
+    def segment_starts(self, count):
+        """Indices among the next `count` frames that open a new segment."""
+        if not self.segmenter:
+            return ()
+        return self.segmenter.place(count, self.dedup.durations if self.dedup else None)
+
+    def collect(self, encoded):
+        self.frames.extend(encoded)
+        self.frame_count += len(encoded)
+
+    def header(self):
+        header = {
+            'fps': self.fps,
+            'cols': self.cols,
+            'rows': self.rows,
+            'frameCount': self.frame_count,
+        }
+        if self.dedup:
+            header['durations'] = self.dedup.durations
+        return header
+
+    def write(self, path):
+        # Same bytes as json.dump(dict(header, frames=frames))
+        with open(path, 'w') as f:
+            f.write(json.dumps(self.header())[:-1])
+            f.write(', "frames": [')
+            for i, frame in enumerate(self.frames):
+                f.write(', ' + frame if i else frame)
+            f.write(']}')
+
+    def write_segments(self, path):
+        """
+        Write the clip as segment files plus a manifest at `path`.
+
+        Segments go to an ascii-segments/ directory beside the manifest as
+        <name>.<index>.<hash>.json, each holding its own frames (and
+        durations), so they can be cached indefinitely; the manifest itself
+        keeps a stable name. Stale segments of the same clip are removed.
+        """
+        path = Path(path)
+        segments_dir = path.parent / SEGMENTS_DIR
+        segments_dir.mkdir(parents=True, exist_ok=True)
+        durations = self.dedup.durations if self.dedup else None
+        starts = self.segmenter.starts
+        bounds = zip(starts, starts[1:] + [self.frame_count])
+
+        segments = []
+        written = set()
+        for index, (first, end) in enumerate(bounds):
+            body = '{'
+            if durations:
+                body += f'"durations": {json.dumps(durations[first:end])}, '
+            body += '"frames": [' + ', '.join(self.frames[first:end]) + ']}'
+            content = body.encode('ascii')
+            digest = hashlib.sha256(content).hexdigest()
+            file_name = f"{path.stem}.{index:03d}.{digest[:12]}.json"
+            (segments_dir / file_name).write_bytes(content)
+            written.add(file_name)
+            segments.append({
+                'url': f"{SEGMENTS_DIR}/{file_name}",
+                'frames': end - first,
+                'duration': sum(durations[first:end]) if durations else end - first,
+                'bytes': len(content),
+                'hash': digest,
+            })
+
+        # Old segments of this clip from earlier runs would otherwise pile up
+        # (the pattern skips renditions' segments, named <name>.<cols>.<index>...)
+        own = re.compile(rf"{re.escape(path.stem)}\.\d+\.[0-9a-f]{{12}}\.json")
+        for stale in segments_dir.glob(f"{glob.escape(path.stem)}.*.json"):
+            if own.fullmatch(stale.name) and stale.name not in written:
+                stale.unlink()
+
+        manifest = self.header()
+        manifest.pop('durations', None)
+        manifest['segmentFrames'] = self.segmenter.length
+        manifest['segments'] = segments
+        path.write_text(json.dumps(manifest))
+        return segments
+
+    def summary(self, size):
+        """Format-specific line for the final report, if any."""
+        return None
+
+
+class DeltaWriter(FramesWriter):
+    """
+    Version 2 JSON: keyframes plus changed-cell patches.
+
+    A keyframe is the full frame string, exactly as in the plain format.
+    Any other frame is a flat list of [row, col, text, row, col, text, ...]
+    runs to paste over the previous frame; changed cells up to `gap` apart
+    share one run, since a run's own JSON costs about as much as that many
+    cells.
+    Frames whose patch would outweigh a keyframe are sent whole.
+    """
+
+    def __init__(self, fps, cols, rows, keyframe_interval=KEYFRAME_INTERVAL, gap=RUN_GAP):
+        super().__init__(fps, cols, rows)
+        self.keyframe_interval = keyframe_interval
+        self.gap = gap
+        self.keyframes = 0
+        self.full_size = 0
+
+    def encoder(self):
+        return partial(encode_delta, cols=self.cols, rows=self.rows,
+                       keyframe_interval=self.keyframe_interval, gap=self.gap)
+
+    def collect(self, encoded):
+        entries, keyframes, full_size = encoded
+        super().collect(entries)
+        self.keyframes += keyframes
+        self.full_size += full_size
+
+    def header(self):
+        header = {
+            'version': DELTA_FORMAT_VERSION,
+            'fps': self.fps,
+            'cols': self.cols,
+            'rows': self.rows,
+            'frameCount': self.frame_count,
+            'keyframeInterval': self.keyframe_interval,
+        }
+        if self.dedup:
+            header['durations'] = self.dedup.durations
+        return header
+
+    def summary(self, size):
+        if not size:
+            return None
+        return (f"Delta: {self.keyframes} keyframes, {self.full_size / 1024:.1f} KB as full frames "
+                f"-> {size / 1024:.1f} KB ({self.full_size / size:.1f}x smaller)")
+
+
+class BinaryWriter(FramesWriter):
+    """
+    Packed binary container for ranged or memory-mapped reads.
+
+    Layout, all little-endian: a BINARY_HEADER (magic, version, palette
+    length, fps, cols, rows, frame count, table offset), the palette as
+    UTF-8, then at the 4-byte aligned table offset frameCount + 1 u32 file
+    offsets, so frame i is bytes [offset[i], offset[i + 1]). Frames hold
+    palette indices, two cells per byte with the first in the high nibble,
+    row-major and padded to a whole byte.
+    """
+
+    def __init__(self, fps, cols, rows, chars=ASCII_CHARS):
+        super().__init__(fps, cols, rows)
+        if len(chars) > 16:
+            raise ValueError("the binary format packs 4-bit indices; palette is limited to 16 characters")
+        self.chars = chars
+        self.index_lut = build_index_lut(chars)
+
+    def encoder(self):
+        return partial(encode_binary, cols=self.cols, rows=self.rows, index_lut=self.index_lut)
+
+    def collect(self, encoded):
+        self.frames.append(encoded)
+        self.frame_count += len(encoded)
+
+    def write(self, path):
+        palette = self.chars.encode('utf-8')
+        frame_bytes = (self.cols * self.rows + 1) // 2
+        table_offset = -(-(BINARY_HEADER.size + len(palette)) // 4) * 4
+        data_offset = table_offset + 4 * (self.frame_count + 1)
+        offsets = data_offset + frame_bytes * np.arange(self.frame_count + 1, dtype='<u4')
+
+        with open(path, 'wb') as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(palette), self.fps,
+                                       self.cols, self.rows, self.frame_count, table_offset))
+            f.write(palette.ljust(table_offset - BINARY_HEADER.size, b'\0'))
+            f.write(offsets.astype('<u4').tobytes())
+            for packed in self.frames:
+                f.write(packed.tobytes())
+
+
+def read_binary(path):
+    """
+    Read a binary container back through mmap.
+
+    Returns (info, frames) where info has fps, cols, rows, frameCount and
+    palette, and frames is a list of frame strings as in the JSON formats.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, version, palette_len, fps, cols, rows, count, table_offset = \
+            BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"{path} is not a version {BINARY_VERSION} ASCII frame container")
+        start = BINARY_HEADER.size
+        palette = data[start:start + palette_len].decode('utf-8')
+        offsets = np.frombuffer(data, dtype='<u4', count=count + 1, offset=table_offset).tolist()
+
+        codes = np.empty((count, rows, cols + 1), dtype='<u2')
+        codes[:, :, cols] = NEWLINE
+        palette_codes = np.array([ord(c) for c in palette], dtype='<u2')
+        for i in range(count):
+            packed = np.frombuffer(data[offsets[i]:offsets[i + 1]], dtype=np.uint8)
+            cells = np.empty(len(packed) * 2, dtype=np.uint8)
+            cells[0::2] = packed >> 4
+            cells[1::2] = packed & 0x0F
+            codes[i, :, :cols] = palette_codes.take(cells[:cols * rows]).reshape(rows, cols)
+
+    info = {'fps': fps, 'cols': cols, 'rows': rows, 'frameCount': count, 'palette': palette}
+    return info, codes_to_text(codes)
+
+
+def read_frames_into(stream, view, frame_size):
+    """Fill `view` from a binary stream; returns the bytes read, in whole frames."""
+    filled = 0
+    while filled < len(view):
+        read = stream.readinto(view[filled:])
+        if not read:
+            break
+        filled += read
+    return filled - filled % frame_size
+
+
+def read_frame_chunks(stream, frame_size, chunk_frames):
+    """
+    Yield whole frames from a binary stream, up to chunk_frames at a time.
+
+    One buffer is reused for every read, so memory stays at a single chunk
+    however long the clip is. A trailing partial frame is dropped.
+    """
+    buffer = bytearray(frame_size * chunk_frames)
+    view = memoryview(buffer)
+    while True:
+        usable = read_frames_into(stream, view, frame_size)
+        if usable:
+            yield view[:usable]
+        if usable < len(buffer):
+            return
+
+
+def _encode_shared(name, size, has_previous, start, keyframes, frame_size, encode):
+    """
+    Encode a chunk from a shared memory slot in a worker process.
+
+    The slot holds the frame before the chunk, then the chunk itself.
+    """
+    slot = shared_memory.SharedMemory(name=name)
     try:
-        subprocess.run([
-            'ffmpeg', '-i', input_file,
-            '-vf', f'scale={cols}:{rows},format=gray',
-            '-r', str(fps),
-            '-f', 'rawvideo',
-            '-pix_fmt', 'gray',
-            raw_file,
-            '-loglevel', 'warning', '-y'
-        ], check=True)
-
-        # Read raw data
-        with open(raw_file, 'rb') as f:
-            raw_data = f.read()
-
-        frame_size = cols * rows
-        frame_count = len(raw_data) // frame_size
-        print(f"Processing {frame_count} frames...")
-
-        frames = []
-        num_chars = len(ASCII_CHARS)
-
-        for f_idx in range(frame_count):
-            offset = f_idx * frame_size
-            frame_bytes = raw_data[offset:offset + frame_size]
-
-            ascii_frame = []
-            for row in range(rows):
-                row_start = row * cols
-                line = ''
-                for col in range(cols):
-                    gray = frame_bytes[row_start + col]
-                    char_idx = gray * num_chars // 256
-                    if char_idx >= num_chars:
-                        char_idx = num_chars - 1
-                    line += ASCII_CHARS[char_idx]
-                ascii_frame.append(line)
-
-            frames.append('\n'.join(ascii_frame))
-
-            if f_idx % 10 == 0:
-                print(f"\rProcessed {f_idx + 1}/{frame_count} frames...", end='', flush=True)
-
-        print(f"\nWriting {output_file}...")
-
-        output = {
-            'fps': fps,
-            'cols': cols,
-            'rows': rows,
-            'frameCount': len(frames),
-            'frames': frames
+        previous = slot.buf[:frame_size] if has_previous else None
+        chunk = slot.buf[frame_size:frame_size + size]
+        try:
+            return encode(chunk, previous, start, keyframes)
+        finally:
+            # Views must go before the mapping can close
+            del previous, chunk
+    finally:
+        slot.close()
+
+
+class ChunkPipeline:
+    """
+    Deduplicate, segment and encode chunks into one writer, in order.
+
+    Deduplication and segmentation run here before a chunk is encoded, so
+    `previous` is always the last frame that was kept and encoders know
+    which frames must be keyframes. With a pool, chunks are copied into a
+    ring of shared memory slots, so workers map the frames instead of
+    unpickling copies. Each slot also carries the frame before its chunk,
+    which is all the delta encoder needs from earlier chunks. Results are
+    collected in submission order; a slot is reused once its chunk has
+    been collected.
+    """
+
+    def __init__(self, writer, frame_size, pool=None, slots=1, metrics=None):
+        self.writer = writer
+        self.frame_size = frame_size
+        self.pool = pool
+        self.encode = writer.encoder()
+        self.stage = metrics.stage if metrics else nullcontext
+        self.previous = None
+        self.start = 0
+        self.slots = []
+        if pool:
+            self.slots = [shared_memory.SharedMemory(create=True,
+                                                     size=frame_size * (CHUNK_FRAMES + 1))
+                          for _ in range(slots)]
+        self.free = deque(self.slots)
+        self.in_flight = deque()
+
+    def feed(self, chunk):
+        """Queue one chunk of whole frames, at most CHUNK_FRAMES of them."""
+        frame_size = self.frame_size
+        slot = None
+        if self.pool:
+            if not self.free:
+                self.collect_next()
+            slot = self.free.popleft()
+            slot.buf[frame_size:frame_size + len(chunk)] = chunk
+            chunk = slot.buf[frame_size:frame_size + len(chunk)]
+
+        size = len(chunk)
+        if self.writer.dedup:
+            with self.stage('dedup'):
+                size = self.writer.dedup.compact(chunk, frame_size)
+        if not size:
+            if slot:
+                self.free.append(slot)
+            return
+
+        keyframes = self.writer.segment_starts(size // frame_size)
+        if slot:
+            if self.previous is not None:
+                slot.buf[:frame_size] = self.previous
+            future = self.pool.submit(_encode_shared, slot.name, size, self.previous is not None,
+                                      self.start, keyframes, frame_size, self.encode)
+            self.in_flight.append((future, slot))
+        else:
+            with self.stage('encode'):
+                self.writer.collect(self.encode(chunk[:size], self.previous, self.start, keyframes))
+        self.previous = bytes(chunk[size - frame_size:size])
+        self.start += size // frame_size
+
+    def collect_next(self):
+        future, slot = self.in_flight.popleft()
+        # With workers, the encode stage is the wait for their results
+        with self.stage('encode'):
+            self.writer.collect(future.result())
+        self.free.append(slot)
+
+    def finish(self):
+        """Collect every chunk still being encoded."""
+        while self.in_flight:
+            self.collect_next()
+
+    def close(self):
+        for slot in self.slots:
+            slot.unlink()
+            try:
+                slot.close()
+            except BufferError:
+                # A traceback still holds a view of the slot; the mapping
+                # goes when the process exits, and the name is gone already
+                pass
+        self.slots = []
+
+
+class Downscaler:
+    """
+    Area-average raw gray frames down to a smaller grid.
+
+    Each output cell is the mean of the source pixels it covers, weighted
+    by overlap, which is what a rendition decoded at its own size would
+    see. Frames go through two small matrix products, rows then columns.
+    """
+
+    def __init__(self, src_cols, src_rows, cols, rows):
+        self.src_shape = (src_rows, src_cols)
+        self.row_weights = area_weights(src_rows, rows)
+        self.col_weights = area_weights(src_cols, cols).T.copy()
+
+    def __call__(self, chunk):
+        count = len(chunk) // (self.src_shape[0] * self.src_shape[1])
+        frames = np.frombuffer(chunk, dtype=np.uint8).reshape(count, *self.src_shape)
+        scaled = self.row_weights @ frames.astype(np.float32) @ self.col_weights
+        return np.rint(scaled).astype(np.uint8).reshape(-1).data
+
+
+def area_weights(size, target):
+    """(target, size) matrix averaging `size` samples into `target` bins."""
+    edges = np.arange(target + 1, dtype=np.float64) * size / target
+    lo = np.arange(size, dtype=np.float64)
+    overlap = (np.minimum(edges[1:, None], lo + 1) - np.maximum(edges[:-1, None], lo)).clip(0)
+    return (overlap / overlap.sum(axis=1, keepdims=True)).astype(np.float32)
+
+
+def convert_stream(stream, writers, frame_size, jobs=1, metrics=None):
+    """
+    Encode every frame in a raw gray stream into each of `writers`.
+
+    `writers` pairs each writer with a function that resamples a chunk to
+    its grid, or None for writers at the stream's own size. Yields the
+    running count of frames read after each chunk. With `metrics`, time
+    spent in each stage and how much the frames change are recorded.
+    """
+    stage = metrics.stage if metrics else nullcontext
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    pipelines = []
+    try:
+        for writer, scale in writers:
+            pipeline = ChunkPipeline(writer, writer.cols * writer.rows, pool,
+                                     jobs * CHUNKS_IN_FLIGHT_PER_JOB, metrics)
+            pipelines.append((pipeline, scale))
+
+        # A pipeline at the stream's size deduplicates the read buffer in
+        # place, so it goes after every pipeline that resamples from it
+        pipelines.sort(key=lambda item: item[1] is None)
+
+        frame_count = 0
+        chunks = read_frame_chunks(stream, frame_size, CHUNK_FRAMES)
+        while True:
+            # Reading waits on the decoder, so this stage is decode time
+            # that conversion did not hide
+            with stage('decode'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            for pipeline, scale in pipelines:
+                scaled = chunk
+                if scale:
+                    with stage('downscale'):
+                        scaled = scale(chunk)
+                if metrics:
+                    # Before feeding, since dedup compacts the chunk in place
+                    metrics.count_changes(pipeline.writer, scaled)
+                pipeline.feed(scaled)
+            frame_count += len(chunk) // frame_size
+            if metrics:
+                metrics.frames = frame_count
+            yield frame_count
+        for pipeline, _ in pipelines:
+            pipeline.finish()
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        for pipeline, _ in pipelines:
+            pipeline.close()
+
+
+class ConversionMetrics:
+    """
+    Measurements gathered by --metrics for one conversion.
+
+    Stages accumulate wall and CPU time across every time they run. CPU
+    time is this process's; ffmpeg and --jobs workers are reported
+    together as children once they have exited. The frame change ratio,
+    one per rendition keyed by its column count, is the share of its cells
+    whose character differs from the previous frame, before any
+    deduplication.
+    """
+
+    def __init__(self, chars=ASCII_CHARS):
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        self.stages = {}
+        self.index_lut = build_index_lut(chars)
+        self.frames = 0
+        # cols -> {'changed': cells, 'compared': cells, 'last': palette indices}
+        self.changes = {}
+
+    @contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                   'calls': 0})
+            totals['wall_seconds'] += time.perf_counter() - wall
+            totals['cpu_seconds'] += time.process_time() - cpu
+            totals['calls'] += 1
+
+    def count_changes(self, writer, chunk):
+        """Count changed characters in a chunk of `writer`'s frames, at its own size."""
+        frame_size = writer.cols * writer.rows
+        count = len(chunk) // frame_size
+        frames = self.index_lut.take(
+            np.frombuffer(chunk, dtype=np.uint8, count=count * frame_size).reshape(count, frame_size))
+        changes = self.changes.setdefault(writer.cols, {'changed': 0, 'compared': 0, 'last': None})
+        if changes['last'] is not None:
+            frames = np.concatenate([changes['last'][None], frames])
+        changes['changed'] += int(np.count_nonzero(frames[1:] != frames[:-1]))
+        changes['compared'] += (len(frames) - 1) * frame_size
+        changes['last'] = frames[-1]
+
+    def report(self, written):
+        """Machine-readable summary, with compressed size estimates for every file written."""
+        # Measured before the compression estimates below, which are not
+        # part of the conversion
+        wall = time.perf_counter() - self.started
+        cpu = time.process_time() - self.started_cpu
+        children = os.times()
+        outputs = []
+        for path in written:
+            data = Path(path).read_bytes()
+            outputs.append({
+                'path': str(path),
+                'bytes': len(data),
+                'gzip_bytes': len(gzip.compress(data, compresslevel=9)),
+                # None when the brotli module is not installed
+                'brotli_bytes': len(brotli.compress(data)) if brotli else None,
+            })
+        return {
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'children_cpu_seconds': children.children_user + children.children_system,
+            'frames': self.frames,
+            'frames_per_second': self.frames / wall if wall > 0 else 0.0,
+            'frame_change_ratio': {
+                str(cols): changes['changed'] / changes['compared'] if changes['compared'] else 0.0
+                for cols, changes in sorted(self.changes.items())
+            },
+            'stages': self.stages,
+            'peak_rss_bytes': peak_rss(),
+            'outputs': outputs,
+            'total': {
+                'bytes': sum(o['bytes'] for o in outputs),
+                'gzip_bytes': sum(o['gzip_bytes'] for o in outputs),
+                'brotli_bytes': sum(o['brotli_bytes'] for o in outputs) if brotli else None,
+            },
         }
 
-        with open(output_file, 'w') as f:
-            json.dump(output, f)
 
-        size_kb = os.path.getsize(output_file) / 1024
-        print(f"Done! Output: {output_file} ({size_kb:.1f} KB)")
+def peak_rss():
+    """Peak resident set size of this process and of its largest child, in bytes."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert video to ASCII frames JSON for web playback')
+    parser.add_argument('input_file', nargs='?',
+                       help='Input video, or a directory of videos to convert in batch')
+    parser.add_argument('output_file', nargs='?', default=None,
+                       help=f'Output JSON (default: {DEFAULT_OUTPUT}); in batch mode, the output '
+                            f'directory (default: {DEFAULT_OUTPUT.parent})')
+    parser.add_argument('cols', nargs='?', type=int, default=160,
+                       help='Columns per frame (default: %(default)s)')
+    parser.add_argument('fps', nargs='?', type=int, default=12,
+                       help='Frames per second (default: %(default)s)')
+    parser.add_argument('--format', choices=['frames', 'delta', 'binary'], default='frames',
+                       help='frames: every frame as a full string; delta: keyframes plus '
+                            'changed-cell runs; binary: 4-bit packed frames with an offset '
+                            'table for ranged loading (default: %(default)s)')
+    parser.add_argument('--keyframe-interval', type=int, default=KEYFRAME_INTERVAL,
+                       help='Frames between delta keyframes (default: %(default)s)')
+    parser.add_argument('--dedup', action='store_true',
+                       help='Merge repeated consecutive frames into one entry with a duration')
+    parser.add_argument('--dedup-tolerance', type=float, default=0.0,
+                       help='With --dedup, fraction of cells that may differ for frames to '
+                            'still count as repeats (default: %(default)s)')
+    parser.add_argument('--segment-seconds', type=float, default=None,
+                       help='Split the output into segment files of about this many seconds, '
+                            'with output_file as their manifest')
+    parser.add_argument('--renditions', type=parse_renditions, default=None, metavar='COLS,...',
+                       help='Write one rendition per column count (e.g. 80,120,160) from a single '
+                            'decode, with output_file as a manifest listing them; replaces cols')
+    parser.add_argument('--raw', type=parse_frame_size, default=None, metavar='WIDTHxHEIGHT',
+                       help='Read input_file as raw 8-bit gray frames of this size instead of '
+                            'decoding it with ffmpeg ("-" reads stdin); frames are taken to be '
+                            'at fps already. Frames exactly cols wide are used as the character '
+                            'grid as is; others are pixels, area-averaged down to cols like a '
+                            'decoded video')
+    parser.add_argument('--batch', nargs='+', metavar='INPUT',
+                       help='Convert these videos (or directories of videos) too, each to '
+                            'ascii-<name>.json in the output directory')
+    parser.add_argument('--metrics', metavar='REPORT',
+                       help='Write stage timings, throughput, peak memory, compressed output '
+                            'sizes and the frame change ratio to this JSON file')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Convert even when the output was already built from the same input '
+                            'and settings')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes for frame conversion (default: 1); in batch mode, '
+                            f'videos converted at once (default: CPU count, {os.cpu_count()})')
+
+    args = parser.parse_args()
+    if not args.input_file and not args.batch:
+        parser.error("input_file is required")
+    if args.keyframe_interval < 1:
+        parser.error("--keyframe-interval must be at least 1")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if not 0 <= args.dedup_tolerance < 1:
+        parser.error("--dedup-tolerance must be in [0, 1)")
+    if args.dedup and args.format == 'binary':
+        parser.error("--dedup needs a JSON format; binary frames have no durations")
+    if args.segment_seconds is not None:
+        if args.segment_seconds <= 0:
+            parser.error("--segment-seconds must be positive")
+        if args.format == 'binary':
+            parser.error("--segment-seconds needs a JSON format; binary containers load by range")
+
+    cache = ConversionCache(enabled=not args.no_cache)
+    inputs = ([args.input_file] if args.input_file else []) + (args.batch or [])
+    if args.batch or os.path.isdir(args.input_file):
+        try:
+            jobs = batch_jobs(expand_inputs(inputs), Path(args.output_file or DEFAULT_OUTPUT.parent),
+                              RENDITION_SUFFIX[args.format])
+        except ValueError as e:
+            parser.error(str(e))
+        if not convert_batch(jobs, args, cache):
+            sys.exit(1)
+        return
+
+    input_file = args.input_file
+    output_file = args.output_file or str(DEFAULT_OUTPUT)
+    key = None
+    if input_file != '-':
+        # Nothing to hash a pipe by, so stdin is always converted
+        key = conversion_key(input_file, args)
+        if cache.fresh(output_file, key):
+            print(f"{output_file} is up to date with {input_file}; nothing to do (--no-cache rebuilds)")
+            return
+
+    metrics = ConversionMetrics() if args.metrics else None
+    written = convert(input_file, output_file, args, args.jobs or 1, metrics=metrics)
+    if key:
+        cache.record(output_file, key, written)
+        cache.save()
+    if metrics:
+        report = metrics_report(metrics, input_file, written, args)
+        Path(args.metrics).write_text(json.dumps(report, indent=2))
+        print(f"Metrics: {report['frames_per_second']:.0f} frames/s, "
+              f"{report['total']['gzip_bytes'] / 1024:.1f} KB gzipped -> {args.metrics}")
+
+
+def convert(input_file, output_file, args, jobs=1, log=print, metrics=None):
+    """
+    Convert one video with the options in `args` and return the paths written.
+
+    `log` takes print()'s arguments; batch mode passes a no-op so
+    conversions running side by side stay quiet. `metrics`, a
+    ConversionMetrics, times every stage.
+    """
+    stage = metrics.stage if metrics else nullcontext
+    fps = args.fps
+    ladder = args.renditions or [args.cols]
+    cols = max(ladder)
+
+    log(f"Converting {input_file} to ASCII...")
+    log(f"Settings: {', '.join(map(str, ladder))} columns, {fps} fps")
+
+    if args.raw:
+        orig_width, orig_height = args.raw
+        if orig_width == cols:
+            # Frames as wide as the widest rendition are a character grid
+            # already, like ffmpeg's output below, and are used as they are.
+            # A cell is two pixels high, so the grid stands for a video
+            # twice its height
+            orig_height *= 2
+    else:
+        # Get video dimensions
+        with stage('probe'):
+            probe = subprocess.run([
+                'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                '-show_entries', 'stream=width,height',
+                '-of', 'csv=p=0', input_file
+            ], capture_output=True, text=True)
+        orig_width, orig_height = map(int, probe.stdout.strip().split(','))
+    rows = frame_rows(orig_width, orig_height, cols)
+
+    # ffmpeg decodes straight to the widest rendition; raw input arrives
+    # at its own size
+    source_shape = args.raw or (cols, rows)
+    frame_size = source_shape[0] * source_shape[1]
+
+    # Every other rendition is downscaled from the decoded frames in-process
+    writers = []
+    for rendition_cols in ladder:
+        rendition_rows = frame_rows(orig_width, orig_height, rendition_cols)
+        log(f"Frame dimensions: {rendition_cols}x{rendition_rows}")
+        writer = make_writer(args, fps, rendition_cols, rendition_rows)
+        scale = None
+        if (rendition_cols, rendition_rows) != source_shape:
+            scale = Downscaler(*source_shape, rendition_cols, rendition_rows)
+        writers.append((writer, scale))
+
+    with open_frames(input_file, cols, rows, fps, args.raw) as stream:
+        log("Processing frames...")
+        for frame_count in convert_stream(stream, writers, frame_size, jobs, metrics):
+            log(f"\rProcessed {frame_count} frames...", end='', flush=True)
+
+    log()
+    with stage('write'):
+        return write_outputs(writers, output_file, args, log)
 
+
+def write_outputs(writers, output_file, args, log=print):
+    """Write the converted clip, or every rendition and their manifest; returns the paths written."""
+    if not args.renditions:
+        _, written = write_output(writers[0][0], output_file, log)
+        return written
+
+    output = Path(output_file)
+    renditions = []
+    written = [output]
+    for writer, _ in writers:
+        path = output.with_name(f"{output.stem}.{writer.cols}{RENDITION_SUFFIX[args.format]}")
+        size, files = write_output(writer, path, log)
+        written += files
+        renditions.append({'url': path.name, 'cols': writer.cols, 'rows': writer.rows,
+                           'bytes': size})
+    manifest = {'fps': args.fps, 'renditions': sorted(renditions, key=lambda r: r['cols'])}
+    output.write_text(json.dumps(manifest))
+    log(f"Rendition manifest: {output_file}")
+    return written
+
+
+@contextmanager
+def open_frames(input_file, cols, rows, fps, raw=None):
+    """
+    Raw gray frames of input_file as a binary stream.
+
+    Videos are decoded by ffmpeg to cols x rows at `fps`, streamed from
+    its stdout so decoding and conversion overlap and the clip never lands
+    on disk. Raw input (`raw` is its (width, height)) is read as is, from
+    stdin when input_file is '-'; its frame rate is taken to be `fps`.
+    """
+    if raw:
+        if input_file == '-':
+            yield sys.stdin.buffer
+        else:
+            with open(input_file, 'rb') as f:
+                yield f
+        return
+
+    decoder = subprocess.Popen([
+        'ffmpeg', '-nostdin', '-i', input_file,
+        '-vf', f'scale={cols}:{rows},format=gray',
+        '-r', str(fps),
+        '-f', 'rawvideo',
+        '-pix_fmt', 'gray',
+        'pipe:1',
+        '-loglevel', 'warning'
+    ], stdout=subprocess.PIPE)
+    try:
+        yield decoder.stdout
     finally:
-        if os.path.exists(raw_file):
-            os.unlink(raw_file)
+        decoder.stdout.close()
+        returncode = decoder.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, decoder.args)
+
+
+def parse_frame_size(value):
+    """argparse type for --raw: WIDTHxHEIGHT."""
+    try:
+        width, height = map(int, value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError("frame dimensions must be at least 1")
+    return width, height
+
+
+def parse_renditions(value):
+    """argparse type for --renditions: comma-separated column counts."""
+    try:
+        ladder = sorted({int(cols) for cols in value.split(',')})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated column counts, got {value!r}")
+    if ladder[0] < 1:
+        raise argparse.ArgumentTypeError("column counts must be at least 1")
+    return ladder
+
+
+def frame_rows(width, height, cols):
+    """Rows for `cols` columns of a width x height video."""
+    return max(1, int(height * cols / width / 2))  # /2 for terminal aspect ratio
+
+
+def make_writer(args, fps, cols, rows):
+    """The writer for the chosen format, with dedup and segmenting set up."""
+    if args.format == 'delta':
+        writer = DeltaWriter(fps, cols, rows, args.keyframe_interval)
+    elif args.format == 'binary':
+        writer = BinaryWriter(fps, cols, rows)
+    else:
+        writer = FramesWriter(fps, cols, rows)
+    if args.dedup:
+        writer.dedup = FrameDeduper(cols, rows, args.dedup_tolerance)
+    if args.segment_seconds:
+        writer.segmenter = Segmenter(max(1, round(args.segment_seconds * fps)))
+    return writer
+
+
+def write_output(writer, output_file, log=print):
+    """Write one converted clip and report it; returns (size in bytes, paths written)."""
+    log(f"Writing {output_file}...")
+    written = [Path(output_file)]
+    if writer.segmenter:
+        segments = writer.write_segments(output_file)
+        size = sum(segment['bytes'] for segment in segments)
+        written += [Path(output_file).parent / segment['url'] for segment in segments]
+        log(f"Done! Output: {output_file} + {len(segments)} segments ({size / 1024:.1f} KB)")
+    else:
+        writer.write(output_file)
+        size = os.path.getsize(output_file)
+        log(f"Done! Output: {output_file} ({size / 1024:.1f} KB)")
+    summary = writer.summary(size)
+    if summary:
+        log(summary)
+    if writer.dedup:
+        log(writer.dedup.summary())
+    return size, written
+
+
+def expand_inputs(inputs):
+    """Input videos, with directories replaced by the videos directly inside them."""
+    videos = []
+    for name in inputs:
+        path = Path(name)
+        if path.is_dir():
+            videos += sorted(p for p in path.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+        elif path.exists():
+            videos.append(path)
+        else:
+            raise ValueError(f"no such input: {name}")
+    return videos
+
+
+def batch_jobs(videos, output_dir, suffix):
+    """(input, output) pairs for batch mode, named ascii-<name><suffix>."""
+    jobs = {}
+    for video in videos:
+        output = output_dir / f"ascii-{video.stem}{suffix}"
+        if output in jobs:
+            raise ValueError(f"{jobs[output]} and {video} would both write {output}")
+        jobs[output] = video
+    return [(video, output) for output, video in jobs.items()]
+
+
+def _convert_quietly(input_file, output_file, args):
+    """
+    convert() for a batch worker process, timed and without progress
+    output. Returns (paths written, seconds, metrics report or None).
+    """
+    started = time.perf_counter()
+    metrics = ConversionMetrics() if args.metrics else None
+    written = convert(str(input_file), str(output_file), args, log=lambda *_, **__: None,
+                      metrics=metrics)
+    report = metrics_report(metrics, str(input_file), written, args) if metrics else None
+    return written, time.perf_counter() - started, report
+
+
+def convert_batch(jobs, args, cache):
+    """
+    Convert (input, output) pairs side by side, skipping outputs the cache
+    shows are already up to date. Returns whether every conversion worked.
+    """
+    pending = []
+    cached = []
+    for input_file, output_file in jobs:
+        key = conversion_key(input_file, args)
+        if cache.fresh(output_file, key):
+            cached.append(output_file)
+            print(f"cached   {output_file}")
+        else:
+            pending.append((input_file, output_file, key))
+
+    rebuilt = []
+    failed = []
+    reports = [{'input': str(input_file), 'output': str(output_file), 'cached': True}
+               for input_file, output_file in jobs if output_file in cached]
+    if pending:
+        Path(pending[0][1]).parent.mkdir(parents=True, exist_ok=True)
+        workers = min(args.jobs or os.cpu_count() or 1, len(pending))
+        print(f"Converting {len(pending)} of {len(jobs)} videos, {workers} at a time...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_convert_quietly, input_file, output_file, args):
+                       (input_file, output_file, key)
+                       for input_file, output_file, key in pending}
+            for future in as_completed(futures):
+                input_file, output_file, key = futures[future]
+                try:
+                    written, seconds, report = future.result()
+                except Exception as e:
+                    failed.append(output_file)
+                    print(f"FAILED   {output_file} from {input_file}: {e}")
+                    continue
+                cache.record(output_file, key, written)
+                rebuilt.append(output_file)
+                if report:
+                    reports.append(report)
+                size = sum(os.path.getsize(path) for path in written)
+                print(f"rebuilt  {output_file} ({seconds:.1f}s, {size / 1024:.1f} KB)")
+        cache.save()
+
+    print(f"\nBatch: {len(rebuilt)} rebuilt, {len(cached)} from cache, {len(failed)} failed")
+    if args.metrics:
+        # Workers are reused across videos, so each peak RSS is the
+        # worker's peak so far rather than that video's alone
+        Path(args.metrics).write_text(json.dumps({'conversions': reports}, indent=2))
+        print(f"Metrics: {args.metrics}")
+    return not failed
+
+
+def metrics_report(metrics, input_file, written, args):
+    """A ConversionMetrics report labelled with what was converted and how."""
+    report = {
+        'input': input_file,
+        'output': str(written[0]),
+        'format': args.format,
+        'cols': args.renditions or [args.cols],
+        'fps': args.fps,
+    }
+    report.update(metrics.report(written))
+    return report
+
+
+def conversion_key(input_file, args):
+    """
+    Hash of everything an output depends on: the input's contents, the
+    palette, the format version and every option that changes the output.
+    """
+    settings = {
+        'input': file_sha256(input_file),
+        'chars': ASCII_CHARS,
+        'format': args.format,
+        'version': FORMAT_VERSIONS[args.format],
+        'cols': args.renditions or [args.cols],
+        'fps': args.fps,
+        'keyframe_interval': args.keyframe_interval if args.format == 'delta' else None,
+        'dedup': args.dedup_tolerance if args.dedup else None,
+        'segment_seconds': args.segment_seconds,
+        'raw': args.raw,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def file_sha256(path):
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_cache_dir():
+    """Per-user location of the conversion cache index."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'damoritoshs-arena' / 'ascii-frames'
+
+
+class ConversionCache:
+    """
+    Which outputs are already built from which conversion key.
+
+    Each output's entry holds the key it was built from and the hash of
+    every file written for it (segments and renditions included), so an
+    output counts as up to date only while all of those files are still
+    exactly as written. The index lives in the per-user cache directory,
+    not beside the outputs, so nothing extra gets deployed.
+    """
+
+    def __init__(self, cache_dir=None, enabled=True):
+        self.path = Path(cache_dir or default_cache_dir()) / 'outputs.json'
+        self.enabled = enabled
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def fresh(self, output_file, key):
+        """Whether output_file was built from `key` and is unchanged since."""
+        entry = self.entries.get(str(Path(output_file).resolve()))
+        if not self.enabled or not entry or entry['key'] != key:
+            return False
+        try:
+            return all(file_sha256(path) == digest for path, digest in entry['files'].items())
+        except OSError:
+            return False
+
+    def record(self, output_file, key, written):
+        self.entries[str(Path(output_file).resolve())] = {
+            'key': key,
+            'files': {str(Path(path).resolve()): file_sha256(path) for path in written},
+        }
+
+    def save(self):
+        """Write the index atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(self.entries, indent=2))
+        os.replace(tmp, self.path)
+
 
 if __name__ == '__main__':
     main()
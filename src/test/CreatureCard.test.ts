@@ -173,3 +173,31 @@ describe('CreatureCard — condition penalty integration', () => {
     })
   })
 })
+
+describe('CreatureCard — precomputed parser fields', () => {
+  it('shows the average damage of an attack', () => {
+    const wrapper = mountCard({
+      attacks: [{
+        name: 'Claw', type: 'melee' as const, bonus: 14, damage: '2d6+4 slashing', traits: [], actions: 1 as const,
+        damageDice: [{ numDice: 2, dieSize: 6, modifier: 4, damageType: 'slashing' }],
+        averageDamage: 11,
+      }],
+    })
+    expect(wrapper.text()).toContain('avg 11')
+  })
+
+  it('leaves out the average for attacks without one', () => {
+    expect(mountCard().text()).not.toContain('avg')
+  })
+
+  it('picks ability icons from actionCost', () => {
+    const wrapper = mountCard({
+      specialAbilities: [
+        { name: 'Paralysis', description: 'Stuns.', actionCost: { kind: 'reaction', actions: 0 } },
+        { name: 'Pounce', description: 'Leaps.', actions: 1, actionCost: { kind: 'action', actions: 1 } },
+        { name: 'Stench', description: 'Smells.', actionCost: { kind: 'passive', actions: 0 } },
+      ],
+    })
+    expect(wrapper.findAll('.ability-block .action-icon').map(el => el.text())).toEqual(['[reaction]', '[one-action]'])
+  })
+})
@@ -0,0 +1,331 @@
+import { describe, it, expect, afterEach, vi } from 'vitest'
+import {
+  applyFrame,
+  decodeFrames,
+  parseContainerHeader,
+  openAsciiContainer,
+  jsonFrameSource,
+  openAsciiSource,
+  pickRendition,
+  measureCharWidth,
+  fitColumns,
+  type AsciiAnimation,
+} from '../utils/asciiAnimation'
+
+const FULL: AsciiAnimation = {
+  fps: 12,
+  cols: 4,
+  rows: 3,
+  frameCount: 3,
+  frames: [
+    ' .:+\n*o#@\n    ',
+    ' .:+\n*oo@\n    ',
+    '@@@@\n*oo@\n  ..',
+  ],
+}
+
+const DELTA: AsciiAnimation = {
+  version: 2,
+  fps: 12,
+  cols: 4,
+  rows: 3,
+  frameCount: 3,
+  keyframeInterval: 48,
+  frames: [
+    ' .:+\n*o#@\n    ',
+    [1, 2, 'o'],
+    [0, 0, '@@@@', 2, 2, '..'],
+  ],
+}
+
+describe('applyFrame', () => {
+  it('splits a keyframe into lines and reports every row on first use', () => {
+    const lines: string[] = []
+    expect(applyFrame(lines, ' .:+\n*o#@\n    ')).toEqual([0, 1, 2])
+    expect(lines).toEqual([' .:+', '*o#@', '    '])
+  })
+
+  it('reports only rows that differ from the previous keyframe', () => {
+    const lines = [' .:+', '*o#@', '    ']
+    expect(applyFrame(lines, ' .:+\n*oo@\n    ')).toEqual([1])
+  })
+
+  it('pastes delta runs over the previous frame', () => {
+    const lines = [' .:+', '*o#@', '    ']
+    expect(applyFrame(lines, [0, 1, '##', 2, 3, '@'])).toEqual([0, 2])
+    expect(lines).toEqual([' ##+', '*o#@', '   @'])
+  })
+
+  it('lists a row once when several runs touch it', () => {
+    const lines = ['    ']
+    expect(applyFrame(lines, [0, 0, '.', 0, 2, ':'])).toEqual([0])
+    expect(lines).toEqual(['. : '])
+  })
+
+  it('treats an empty patch as a repeated frame', () => {
+    const lines = ['ab']
+    expect(applyFrame(lines, [])).toEqual([])
+    expect(lines).toEqual(['ab'])
+  })
+})
+
+describe('decodeFrames', () => {
+  it('returns version 1 frames unchanged', () => {
+    expect(decodeFrames(FULL)).toEqual(FULL.frames)
+  })
+
+  it('decodes delta frames to the same text as full frames', () => {
+    expect(decodeFrames(DELTA)).toEqual(FULL.frames)
+  })
+})
+
+/**
+ * Build a container the way video-to-ascii.py's BinaryWriter lays it out.
+ */
+function buildContainer(frames: number[][], cols: number, rows: number, palette: string): Uint8Array {
+  const paletteBytes = new TextEncoder().encode(palette)
+  const frameBytes = Math.ceil((cols * rows) / 2)
+  const tableOffset = Math.ceil((20 + paletteBytes.length) / 4) * 4
+  const dataOffset = tableOffset + 4 * (frames.length + 1)
+  const bytes = new Uint8Array(dataOffset + frameBytes * frames.length)
+  const view = new DataView(bytes.buffer)
+  bytes.set([...'ASCF'].map(c => c.charCodeAt(0)), 0)
+  view.setUint8(4, 1)
+  view.setUint8(5, paletteBytes.length)
+  view.setUint16(6, 12, true)
+  view.setUint16(8, cols, true)
+  view.setUint16(10, rows, true)
+  view.setUint32(12, frames.length, true)
+  view.setUint32(16, tableOffset, true)
+  bytes.set(paletteBytes, 20)
+  for (let i = 0; i <= frames.length; i++) {
+    view.setUint32(tableOffset + i * 4, dataOffset + i * frameBytes, true)
+  }
+  frames.forEach((cells, i) => {
+    for (let c = 0; c < cells.length; c++) {
+      const at = dataOffset + i * frameBytes + (c >> 1)
+      bytes[at] |= c % 2 ? cells[c] : cells[c] << 4
+    }
+  })
+  return bytes
+}
+
+function serve(file: Uint8Array, ranges = true) {
+  const requests: string[] = []
+  vi.stubGlobal('fetch', vi.fn(async (_src: string, init?: { headers?: Record<string, string> }) => {
+    const range = init?.headers?.Range
+    requests.push(range ?? 'all')
+    const match = ranges && range ? /bytes=(\d+)-(\d+)/.exec(range) : null
+    const body = match ? file.slice(Number(match[1]), Number(match[2]) + 1) : file
+    return { ok: true, status: match ? 206 : 200, arrayBuffer: async () => body.buffer }
+  }))
+  return requests
+}
+
+describe('binary container', () => {
+  const frames = [[0, 1, 2, 3, 0, 1], [3, 3, 3, 0, 0, 0], [0, 0, 0, 0, 0, 0]]
+  const file = buildContainer(frames, 3, 2, ' .·#')
+
+  afterEach(() => {
+    vi.unstubAllGlobals()
+  })
+
+  it('parses the header and palette', () => {
+    expect(parseContainerHeader(file)).toEqual({
+      fps: 12, cols: 3, rows: 2, frameCount: 3, palette: [' ', '.', '·', '#'], tableOffset: 28,
+    })
+  })
+
+  it('rejects files without the container magic', () => {
+    expect(() => parseContainerHeader(new Uint8Array(32))).toThrow('ASCII frame container')
+  })
+
+  it('decodes frames on demand over range requests', async () => {
+    const requests = serve(file)
+    const source = await openAsciiContainer('/clip.bin')
+    expect(source.frameCount).toBe(3)
+    expect(source.frame(0)).toBeNull()
+    await source.load(0)
+    expect(source.frame(0)).toBe(' .·\n# .')
+    expect(source.frame(1)).toBe('###\n   ')
+    expect(source.frame(3)).toBeNull()
+    expect(requests.every(r => r.startsWith('bytes='))).toBe(true)
+  })
+
+  it('decodes odd cell counts without spilling into the next frame', async () => {
+    serve(buildContainer([[1, 2, 3], [3, 2, 1]], 3, 1, ' .:#'))
+    const source = await openAsciiContainer('/odd.bin')
+    await source.load(0)
+    expect([source.frame(0), source.frame(1)]).toEqual(['.:#', '#:.'])
+  })
+
+  it('works when the server ignores Range', async () => {
+    const requests = serve(file, false)
+    const source = await openAsciiContainer('/clip.bin')
+    await source.load(2)
+    expect(source.frame(2)).toBe('   \n   ')
+    expect(requests).toHaveLength(1)
+  })
+})
+
+describe('durations', () => {
+  const DEDUPED: AsciiAnimation = {
+    fps: 12,
+    cols: 4,
+    rows: 3,
+    frameCount: 2,
+    durations: [3, 1],
+    frames: [FULL.frames[0], FULL.frames[2]],
+  }
+
+  it('repeats merged frames when decoding to full frames', () => {
+    expect(decodeFrames(DEDUPED)).toEqual([
+      FULL.frames[0], FULL.frames[0], FULL.frames[0], FULL.frames[2],
+    ])
+  })
+
+  it('applies to delta entries too', () => {
+    const delta = { ...DELTA, frameCount: 2, durations: [2, 1], frames: [DELTA.frames[0], [1, 2, 'o']] }
+    expect(decodeFrames(delta)).toEqual([FULL.frames[0], FULL.frames[0], FULL.frames[1]])
+  })
+
+  it('defaults every frame to one interval', () => {
+    const source = jsonFrameSource(FULL)
+    expect([0, 1, 2].map(i => source.duration(i))).toEqual([1, 1, 1])
+    expect(jsonFrameSource(DEDUPED).duration(0)).toBe(3)
+  })
+})
+
+describe('segmented animations', () => {
+  const MANIFEST = {
+    version: 2,
+    fps: 12,
+    cols: 4,
+    rows: 3,
+    frameCount: 3,
+    keyframeInterval: 48,
+    segmentFrames: 2,
+    segments: [
+      { url: 'ascii-segments/clip.000.aaaa.json', frames: 2, duration: 2, bytes: 0, hash: 'aaaa' },
+      { url: 'ascii-segments/clip.001.bbbb.json', frames: 1, duration: 3, bytes: 0, hash: 'bbbb' },
+    ],
+  }
+  const FILES: Record<string, unknown> = {
+    '/media/clip.json': MANIFEST,
+    '/media/ascii-segments/clip.000.aaaa.json': { frames: [DELTA.frames[0], DELTA.frames[1]] },
+    '/media/ascii-segments/clip.001.bbbb.json': { durations: [3], frames: [FULL.frames[2]] },
+  }
+
+  function serveJson() {
+    const requests: string[] = []
+    vi.stubGlobal('fetch', vi.fn(async (src: string) => {
+      requests.push(src)
+      return { ok: src in FILES, status: src in FILES ? 200 : 404, json: async () => FILES[src] }
+    }))
+    return requests
+  }
+
+  afterEach(() => {
+    vi.unstubAllGlobals()
+  })
+
+  it('loads only the first segment before playback', async () => {
+    const requests = serveJson()
+    const source = await openAsciiSource('/media/clip.json')
+    await source.load(0)
+    expect(source.frameCount).toBe(3)
+    expect(requests).toEqual(['/media/clip.json', '/media/ascii-segments/clip.000.aaaa.json'])
+  })
+
+  it('prefetches the next segment once a segment starts playing', async () => {
+    const requests = serveJson()
+    const source = await openAsciiSource('/media/clip.json')
+    await source.load(0)
+    expect(source.frame(0)).toBe(DELTA.frames[0])
+    expect(requests).toHaveLength(3)
+    await source.load(2)
+    expect(source.frame(2)).toBe(FULL.frames[2])
+    expect(source.duration(2)).toBe(3)
+    expect(source.duration(1)).toBe(1)
+  })
+
+  it('returns null for frames whose segment has not arrived', async () => {
+    serveJson()
+    const source = await openAsciiSource('/media/clip.json')
+    expect(source.frame(2)).toBeNull()
+    expect(source.frame(3)).toBeNull()
+  })
+})
+
+describe('renditions', () => {
+  const RENDITIONS = [
+    { url: 'clip.120.json', cols: 120, rows: 33, bytes: 0 },
+    { url: 'clip.80.json', cols: 80, rows: 22, bytes: 0 },
+    { url: 'clip.160.json', cols: 160, rows: 44, bytes: 0 },
+  ]
+
+  afterEach(() => {
+    vi.unstubAllGlobals()
+  })
+
+  it('picks the widest rendition that fits', () => {
+    expect(pickRendition(RENDITIONS, 150).cols).toBe(120)
+    expect(pickRendition(RENDITIONS, 160).cols).toBe(160)
+    expect(pickRendition(RENDITIONS, Infinity).cols).toBe(160)
+  })
+
+  it('falls back to the narrowest rendition on small screens', () => {
+    expect(pickRendition(RENDITIONS, 40).cols).toBe(80)
+  })
+
+  it('opens the chosen rendition relative to the manifest', async () => {
+    const requests: string[] = []
+    vi.stubGlobal('fetch', vi.fn(async (src: string) => {
+      requests.push(src)
+      const data = src.endsWith('clip.json') ? { fps: 12, renditions: RENDITIONS } : FULL
+      return { ok: true, status: 200, json: async () => data }
+    }))
+    const source = await openAsciiSource('/media/clip.json', 100)
+    expect(requests).toEqual(['/media/clip.json', '/media/clip.80.json'])
+    expect(source.frame(0)).toBe(FULL.frames[0])
+    // Kept so a player can re-pick when its width changes
+    expect(source.rendition?.cols).toBe(80)
+    expect(source.renditions).toHaveLength(3)
+  })
+})
+
+describe('measuring columns', () => {
+  afterEach(() => {
+    vi.restoreAllMocks()
+    document.body.innerHTML = ''
+  })
+
+  function player(fontSize: string, containerWidth: number, padding = '0px') {
+    const container = document.createElement('div')
+    container.style.paddingLeft = padding
+    container.style.paddingRight = padding
+    Object.defineProperty(container, 'clientWidth', { value: containerWidth })
+    const el = document.createElement('pre')
+    el.style.fontSize = fontSize
+    container.appendChild(el)
+    document.body.appendChild(container)
+    return el
+  }
+
+  it('measures a character from the rendered font', () => {
+    vi.spyOn(HTMLElement.prototype, 'getBoundingClientRect').mockReturnValue({ width: 72 } as DOMRect)
+    expect(measureCharWidth(player('12px', 0))).toBeCloseTo(7.2)
+  })
+
+  it('falls back to 0.6em of the computed font size without layout', () => {
+    expect(measureCharWidth(player('10px', 0))).toBeCloseTo(6)
+  })
+
+  it('fits columns to the container, less its padding', () => {
+    expect(fitColumns(player('10px', 620, '10px'))).toBe(100)
+  })
+
+  it('uses the window width when the container has none', () => {
+    expect(fitColumns(player('10px', 0))).toBe(Math.floor(window.innerWidth / 6))
+  })
+})
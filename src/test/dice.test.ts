@@ -2,6 +2,8 @@ import { describe, it, expect, beforeEach, vi } from 'vitest'
 import {
   rollD20,
   rollDamage,
+  rollDamageGroups,
+  attackDamageGroups,
   rollFlat,
   formatModifier,
   getRecallKnowledgeDCs,
@@ -101,6 +103,35 @@ describe('rollDamage', () => {
   })
 })
 
+describe('precomputed damage dice', () => {
+  it('uses damageDice from the parser without reading the damage text', () => {
+    const damageDice = [{ numDice: 2, dieSize: 8, modifier: 6, damageType: 'piercing' }]
+    expect(attackDamageGroups({ damage: 'unparseable', damageDice })).toBe(damageDice)
+  })
+
+  it('falls back to parsing the damage text', () => {
+    expect(attackDamageGroups({ damage: '2d8+6 piercing plus 1d6 fire' })).toEqual([
+      { numDice: 2, dieSize: 8, modifier: 6, damageType: 'piercing' },
+      { numDice: 1, dieSize: 6, modifier: 0, damageType: 'fire' },
+    ])
+  })
+
+  it('has no groups for a hazard action without damage', () => {
+    expect(attackDamageGroups({})).toEqual([])
+  })
+
+  it('rolls groups the same way as the expression', () => {
+    vi.spyOn(Math, 'random').mockReturnValue(0.5)
+    const fromText = rollDamage('2d8+6 piercing plus 1d6 fire', 'Jaws', 'Drake', true)
+    const fromGroups = rollDamageGroups(
+      attackDamageGroups({ damage: '2d8+6 piercing plus 1d6 fire' }),
+      '2d8+6 piercing plus 1d6 fire', 'Jaws', 'Drake', true,
+    )
+    expect(fromGroups.total).toBe(fromText.total)
+    expect(fromGroups.breakdown).toBe(fromText.breakdown)
+  })
+})
+
 describe('rollFlat', () => {
   it('rolls vs DC', () => {
     vi.spyOn(Math, 'random').mockReturnValue(0.5) // roll = 11
@@ -3,6 +3,8 @@
  * Based on the remaster format from Alien Archive
  */
 
+import type { DiceGroup } from '../utils/dice'
+
 export interface AbilityScores {
   str: number
   dex: number
@@ -27,6 +29,10 @@ export interface Attack {
   actions: 1 | 2 | 3
   range?: string
   area?: string
+  // Precomputed by the PDF parser; absent on hand-made and AoN creatures
+  damageDice?: DiceGroup[]
+  averageDamage?: number
+  mapBonuses?: [number, number, number]
 }
 
 export interface SpellEntry {
@@ -47,11 +53,17 @@ export interface SpellcastingConfig {
   notes: string // For describing spells without specific selection
 }
 
+export interface ActionCost {
+  kind: 'action' | 'reaction' | 'free' | 'passive'
+  actions: 0 | 1 | 2 | 3 // Actions spent from the turn
+}
+
 export interface SpecialAbility {
   name: string
   actions?: 0 | 1 | 2 | 3 | 'reaction' | 'free'
   traits?: string[]
   description: string
+  actionCost?: ActionCost
 }
 
 export interface Creature {
@@ -5,6 +5,8 @@
  * They can be simple (one-time effects) or complex (take turns in initiative).
  */
 
+import type { DiceGroup } from '../utils/dice'
+
 export type HazardComplexity = 'simple' | 'complex'
 export type HazardType = 'trap' | 'environmental' | 'haunt'
 export type TrapSubtype = 'mechanical' | 'magical' | 'tech'
@@ -39,6 +41,7 @@ export interface HazardAction {
   actionType?: 'reaction' | 'free' | number  // number for action cost
   effect: string
   damage?: string
+  damageDice?: DiceGroup[]  // Precomputed by the PDF parser
   damageType?: string
   dc?: number
   save?: 'fortitude' | 'reflex' | 'will'
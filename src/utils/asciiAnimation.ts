@@ -0,0 +1,417 @@
+/**
+ * ASCII animation data written by scripts/video-to-ascii.py
+ *
+ * Version 1 (no `version` field) stores every frame as a full string.
+ * Version 2 stores periodic keyframes as full strings and every other frame
+ * as a flat [row, col, text, row, col, text, ...] list of runs to paste over
+ * the previous frame.
+ *
+ * Either version may carry `durations`: how many frames at `fps` each
+ * entry stays on screen, when repeated frames were merged. Without it
+ * every entry lasts one frame.
+ *
+ * Segmented output replaces `frames` with a manifest listing segment files,
+ * each holding the `frames` (and `durations`) of a few seconds of the clip.
+ * Every segment starts with a full frame.
+ *
+ * A rendition manifest lists the same clip at several column counts, each
+ * in any of the forms above, so players can pick one that fits.
+ */
+
+export type AsciiPatch = (number | string)[]
+export type AsciiFrame = string | AsciiPatch
+
+export interface AsciiAnimation {
+  version?: number
+  fps: number
+  cols: number
+  rows?: number
+  frameCount: number
+  keyframeInterval?: number
+  durations?: number[]
+  frames: AsciiFrame[]
+}
+
+export interface AsciiSegment {
+  /** Relative to the manifest */
+  url: string
+  frames: number
+  /** Frame intervals the segment plays for */
+  duration: number
+  bytes: number
+  hash: string
+}
+
+export interface AsciiSegmentManifest extends Omit<AsciiAnimation, 'frames' | 'durations'> {
+  segmentFrames: number
+  segments: AsciiSegment[]
+}
+
+export interface AsciiRendition {
+  /** Relative to the manifest */
+  url: string
+  cols: number
+  rows: number
+  bytes: number
+}
+
+export interface AsciiRenditionManifest {
+  fps: number
+  renditions: AsciiRendition[]
+}
+
+/**
+ * Apply one frame to `lines` in place and return the rows that changed.
+ * Work is proportional to the rows a patch touches, so callers can update
+ * just those rows instead of re-rendering the whole frame.
+ */
+export function applyFrame(lines: string[], frame: AsciiFrame): number[] {
+  const changed: number[] = []
+
+  if (typeof frame === 'string') {
+    const next = frame.split('\n')
+    for (let row = 0; row < next.length; row++) {
+      if (lines[row] !== next[row]) {
+        lines[row] = next[row]
+        changed.push(row)
+      }
+    }
+    if (lines.length > next.length) lines.length = next.length
+    return changed
+  }
+
+  for (let i = 0; i < frame.length; i += 3) {
+    const row = frame[i] as number
+    const col = frame[i + 1] as number
+    const text = frame[i + 2] as string
+    const line = lines[row]
+    lines[row] = line.slice(0, col) + text + line.slice(col + text.length)
+    // Runs are emitted in row order, so repeats are always adjacent
+    if (changed[changed.length - 1] !== row) changed.push(row)
+  }
+  return changed
+}
+
+/**
+ * Full text of every frame at `fps`, for callers that want plain strings.
+ * Entries with a duration are repeated, as if they had never been merged.
+ */
+export function decodeFrames(data: AsciiAnimation): string[] {
+  const lines: string[] = []
+  return data.frames.flatMap((frame, index) => {
+    applyFrame(lines, frame)
+    return new Array<string>(data.durations?.[index] ?? 1).fill(lines.join('\n'))
+  })
+}
+
+/**
+ * Where a player reads frames from, whatever the file format.
+ */
+export interface AsciiFrameSource {
+  fps: number
+  cols: number
+  rows: number
+  frameCount: number
+  /** Frame `index` if it is loaded; otherwise starts loading it and returns null */
+  frame(index: number): AsciiFrame | null
+  /** How many frame intervals (1000 / fps ms) frame `index` stays on screen */
+  duration(index: number): number
+  /** Resolves once frame `index` can be read */
+  load(index: number): Promise<void>
+  /** Set when opened through a rendition manifest: every rendition, and the one opened */
+  renditions?: AsciiRendition[]
+  rendition?: AsciiRendition
+}
+
+export function jsonFrameSource(data: AsciiAnimation): AsciiFrameSource {
+  return {
+    fps: data.fps,
+    cols: data.cols,
+    rows: data.rows ?? (data.frames.length ? (data.frames[0] as string).split('\n').length : 0),
+    frameCount: data.frames.length,
+    frame: index => data.frames[index] ?? null,
+    duration: index => data.durations?.[index] ?? 1,
+    load: async () => {},
+  }
+}
+
+// Binary container written by video-to-ascii.py --format binary; see
+// BinaryWriter there for the layout
+export const CONTAINER_MAGIC = 'ASCF'
+export const CONTAINER_VERSION = 1
+const CONTAINER_HEADER_BYTES = 20
+// First request size: covers the header, palette and the frame table of
+// short clips, so they need no second round trip before frame 0
+const CONTAINER_PROBE_BYTES = 16384
+const CONTAINER_BLOCK_FRAMES = 24
+
+export interface AsciiContainerHeader {
+  fps: number
+  cols: number
+  rows: number
+  frameCount: number
+  palette: string[]
+  tableOffset: number
+}
+
+export function parseContainerHeader(bytes: Uint8Array): AsciiContainerHeader {
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+  const magic = String.fromCharCode(...bytes.subarray(0, 4))
+  if (magic !== CONTAINER_MAGIC || view.getUint8(4) !== CONTAINER_VERSION) {
+    throw new Error(`Not a version ${CONTAINER_VERSION} ASCII frame container`)
+  }
+  const paletteBytes = view.getUint8(5)
+  const palette = new TextDecoder().decode(
+    bytes.subarray(CONTAINER_HEADER_BYTES, CONTAINER_HEADER_BYTES + paletteBytes)
+  )
+  return {
+    fps: view.getUint16(6, true),
+    cols: view.getUint16(8, true),
+    rows: view.getUint16(10, true),
+    frameCount: view.getUint32(12, true),
+    palette: Array.from(palette),
+    tableOffset: view.getUint32(16, true),
+  }
+}
+
+/**
+ * Two-character strings for every packed byte, high nibble first.
+ */
+function pairTable(palette: string[]): string[] {
+  const pairs: string[] = []
+  for (let byte = 0; byte < 256; byte++) {
+    pairs.push((palette[byte >> 4] ?? ' ') + (palette[byte & 0x0f] ?? ' '))
+  }
+  return pairs
+}
+
+export function decodePackedFrame(
+  bytes: Uint8Array,
+  cols: number,
+  rows: number,
+  pairs: string[]
+): string {
+  const cells: string[] = new Array(bytes.length)
+  for (let i = 0; i < bytes.length; i++) cells[i] = pairs[bytes[i]]
+  const text = cells.join('')
+  const lines: string[] = new Array(rows)
+  for (let row = 0; row < rows; row++) {
+    lines[row] = text.slice(row * cols, (row + 1) * cols)
+  }
+  return lines.join('\n')
+}
+
+/**
+ * Open a binary container with HTTP range requests. Only the header and
+ * frame table are fetched up front; frames arrive in blocks as playback
+ * reaches them and stay packed until they are shown. Servers that ignore
+ * Range send the whole file on the first request, which works the same.
+ */
+export async function openAsciiContainer(src: string): Promise<AsciiFrameSource> {
+  let whole: Uint8Array | null = null
+
+  async function fetchRange(start: number, end: number): Promise<Uint8Array> {
+    if (whole) return whole.subarray(start, end)
+    const response = await fetch(src, { headers: { Range: `bytes=${start}-${end - 1}` } })
+    if (!response.ok) throw new Error(`Failed to load ${src}: ${response.status}`)
+    const bytes = new Uint8Array(await response.arrayBuffer())
+    if (response.status === 206) return bytes
+    whole = bytes
+    return bytes.subarray(start, end)
+  }
+
+  const probe = await fetchRange(0, CONTAINER_PROBE_BYTES)
+  const header = parseContainerHeader(probe)
+  const tableEnd = header.tableOffset + 4 * (header.frameCount + 1)
+  const table = tableEnd <= probe.length
+    ? probe.slice(header.tableOffset, tableEnd)
+    : await fetchRange(header.tableOffset, tableEnd)
+  const tableView = new DataView(table.buffer, table.byteOffset, table.byteLength)
+  const offset = (index: number) => tableView.getUint32(index * 4, true)
+
+  const pairs = pairTable(header.palette)
+  const blocks = new Map<number, Uint8Array>()
+  const pending = new Map<number, Promise<void>>()
+
+  function loadBlock(block: number): Promise<void> {
+    if (blocks.has(block)) return Promise.resolve()
+    let request = pending.get(block)
+    if (!request) {
+      const first = block * CONTAINER_BLOCK_FRAMES
+      const last = Math.min(first + CONTAINER_BLOCK_FRAMES, header.frameCount)
+      request = fetchRange(offset(first), offset(last))
+        .then(bytes => { blocks.set(block, bytes) })
+        .finally(() => { pending.delete(block) })
+      pending.set(block, request)
+    }
+    return request
+  }
+
+  function prefetch(block: number) {
+    if (block * CONTAINER_BLOCK_FRAMES < header.frameCount) {
+      loadBlock(block).catch(err => console.error('Failed to prefetch ASCII frames:', err))
+    }
+  }
+
+  return {
+    fps: header.fps,
+    cols: header.cols,
+    rows: header.rows,
+    frameCount: header.frameCount,
+    frame(index) {
+      if (index < 0 || index >= header.frameCount) return null
+      const block = Math.floor(index / CONTAINER_BLOCK_FRAMES)
+      const bytes = blocks.get(block)
+      if (!bytes) {
+        prefetch(block)
+        return null
+      }
+      // Halfway through a block, start fetching the next one
+      if (index % CONTAINER_BLOCK_FRAMES >= CONTAINER_BLOCK_FRAMES / 2) prefetch(block + 1)
+      const base = offset(block * CONTAINER_BLOCK_FRAMES)
+      const packed = bytes.subarray(offset(index) - base, offset(index + 1) - base)
+      return decodePackedFrame(packed, header.cols, header.rows, pairs)
+    },
+    duration: () => 1,
+    load(index) {
+      return loadBlock(Math.floor(index / CONTAINER_BLOCK_FRAMES))
+    },
+  }
+}
+
+/**
+ * Play a segmented animation from its manifest. Segments are fetched as
+ * playback reaches them, and the next one as soon as a segment starts
+ * playing, so only the first has to arrive before playback can begin.
+ */
+export function segmentedFrameSource(src: string, manifest: AsciiSegmentManifest): AsciiFrameSource {
+  const base = baseUrl(src)
+  // Index of each segment's first entry, plus the total at the end
+  const starts = [0]
+  for (const segment of manifest.segments) starts.push(starts[starts.length - 1] + segment.frames)
+
+  const loaded = new Map<number, Pick<AsciiAnimation, 'frames' | 'durations'>>()
+  const pending = new Map<number, Promise<void>>()
+
+  function segmentOf(index: number): number {
+    let low = 0
+    let high = manifest.segments.length - 1
+    while (low < high) {
+      const mid = (low + high + 1) >> 1
+      if (starts[mid] <= index) low = mid
+      else high = mid - 1
+    }
+    return low
+  }
+
+  function loadSegment(segment: number): Promise<void> {
+    if (loaded.has(segment)) return Promise.resolve()
+    let request = pending.get(segment)
+    if (!request) {
+      const url = base + manifest.segments[segment].url
+      request = fetch(url)
+        .then(response => {
+          if (!response.ok) throw new Error(`Failed to load ${url}: ${response.status}`)
+          return response.json()
+        })
+        .then(data => { loaded.set(segment, data) })
+        .finally(() => { pending.delete(segment) })
+      pending.set(segment, request)
+    }
+    return request
+  }
+
+  function prefetch(segment: number) {
+    if (segment < manifest.segments.length) {
+      loadSegment(segment).catch(err => console.error('Failed to prefetch ASCII segment:', err))
+    }
+  }
+
+  const frameCount = starts[starts.length - 1]
+  return {
+    fps: manifest.fps,
+    cols: manifest.cols,
+    rows: manifest.rows ?? 0,
+    frameCount,
+    frame(index) {
+      if (index < 0 || index >= frameCount) return null
+      const segment = segmentOf(index)
+      const data = loaded.get(segment)
+      if (!data) {
+        prefetch(segment)
+        return null
+      }
+      prefetch(segment + 1)
+      return data.frames[index - starts[segment]]
+    },
+    duration(index) {
+      const segment = segmentOf(index)
+      return loaded.get(segment)?.durations?.[index - starts[segment]] ?? 1
+    },
+    load(index) {
+      return loadSegment(segmentOf(index))
+    },
+  }
+}
+
+/**
+ * The widest rendition that fits in `maxCols` columns, or the narrowest
+ * if none does.
+ */
+export function pickRendition(renditions: AsciiRendition[], maxCols: number): AsciiRendition {
+  const byWidth = [...renditions].sort((a, b) => a.cols - b.cols)
+  return byWidth.filter(rendition => rendition.cols <= maxCols).pop() ?? byWidth[0]
+}
+
+/**
+ * Width in px of one character cell of `el`'s font, measured from a
+ * hidden probe so font-size overrides and letter-spacing are included.
+ * Without layout (e.g. jsdom) it falls back to 0.6em, Courier's advance.
+ */
+export function measureCharWidth(el: HTMLElement): number {
+  const probe = document.createElement('span')
+  probe.textContent = '0'.repeat(10)
+  probe.style.position = 'absolute'
+  probe.style.visibility = 'hidden'
+  el.appendChild(probe)
+  const width = probe.getBoundingClientRect().width / 10
+  el.removeChild(probe)
+  return width || (parseFloat(getComputedStyle(el).fontSize) || 8) * 0.6
+}
+
+/**
+ * How many of `el`'s characters fit across its container (the window if
+ * it has none), for picking a rendition.
+ */
+export function fitColumns(el: HTMLElement): number {
+  const container = el.parentElement
+  let width = window.innerWidth
+  if (container && container.clientWidth) {
+    const style = getComputedStyle(container)
+    width = container.clientWidth - (parseFloat(style.paddingLeft) || 0) - (parseFloat(style.paddingRight) || 0)
+  }
+  return Math.max(1, Math.floor(width / measureCharWidth(el)))
+}
+
+/** Directory part of a URL, for resolving manifest entries */
+function baseUrl(src: string): string {
+  return src.slice(0, src.lastIndexOf('/') + 1)
+}
+
+/**
+ * Open any ASCII animation: `.bin` files as ranged binary containers,
+ * segment manifests segment by segment, anything else as JSON. Rendition
+ * manifests open the rendition that best fits `maxCols`.
+ */
+export async function openAsciiSource(src: string, maxCols = Infinity): Promise<AsciiFrameSource> {
+  if (src.endsWith('.bin')) return openAsciiContainer(src)
+  const response = await fetch(src)
+  const data = await response.json()
+  if ('renditions' in data) {
+    const rendition = pickRendition(data.renditions, maxCols)
+    const source = await openAsciiSource(baseUrl(src) + rendition.url, maxCols)
+    return Object.assign(source, { renditions: data.renditions as AsciiRendition[], rendition })
+  }
+  if ('segments' in data) return segmentedFrameSource(src, data)
+  return jsonFrameSource(data)
+}
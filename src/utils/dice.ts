@@ -116,6 +116,14 @@ export function parseDamageExpression(expression: string): DiceGroup[] {
   return groups
 }
 
+/**
+ * Dice groups for an attack or hazard action: the parser's precomputed
+ * damageDice when present, otherwise parsed from the damage text.
+ */
+export function attackDamageGroups(attack: { damage?: string; damageDice?: DiceGroup[] }): DiceGroup[] {
+  return attack.damageDice ?? parseDamageExpression(cleanDamage(attack.damage ?? ''))
+}
+
 /**
  * Roll damage dice (e.g., "2d6+4 fire" or "1d6+3 piercing plus 1d4 acid")
  * Rolls ALL dice groups in the expression.
@@ -128,8 +136,20 @@ export function rollDamage(
   critical: boolean = false,
   bonusDamage: number = 0
 ): RollResult {
-  const groups = parseDamageExpression(expression)
+  return rollDamageGroups(parseDamageExpression(expression), expression, name, source, critical, bonusDamage)
+}
 
+/**
+ * Roll already-parsed dice groups; `expression` is only shown if there are none.
+ */
+export function rollDamageGroups(
+  groups: DiceGroup[],
+  expression: string,
+  name: string,
+  source: string = 'Unknown',
+  critical: boolean = false,
+  bonusDamage: number = 0
+): RollResult {
   if (groups.length === 0) {
     return {
       id: generateId(),